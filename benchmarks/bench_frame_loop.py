@@ -0,0 +1,229 @@
+"""
+Frame loop benchmark - reproducible stress scenarios for Game
+
+Drives Game through scripted scenarios on the SDL dummy video driver and
+measures simulation ticks per second, draw time per frame and peak traced
+memory from Game construction on. Timings are medians over several passes.
+Results are written as JSON; --compare flags regressions against a stored
+baseline and exits non-zero when any metric regresses by more than the
+threshold or the run-to-run spread, whichever is larger.
+
+Usage:
+    python benchmarks/bench_frame_loop.py --out baseline.json
+    python benchmarks/bench_frame_loop.py --compare baseline.json --threshold 0.10
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+
+import jaguar_game_python as game
+
+# Weave up and down across the field, pouncing twice a second
+SCRIPT = game.ScriptedInput([(15, game.INPUT_UP | game.INPUT_POUNCE), (45, game.INPUT_UP),
+                             (15, game.INPUT_DOWN | game.INPUT_POUNCE), (45, game.INPUT_DOWN)] * 50)
+
+FLOOD_PREY = 500
+FLOOD_PARTICLES = 5000
+
+# Metric name -> True when higher is better
+METRICS = {
+    'ticks_per_sec': True,
+    'draw_ms_mean': False,
+    'draw_ms_p95': False,
+    'peak_kib': False,
+}
+
+
+def setup_menu(g):
+    """Title screen, nothing simulated"""
+    g.state = game.MENU
+
+
+def setup_normal(g):
+    """Regular play from a fresh session"""
+    g.reset_game()
+
+
+def setup_max_difficulty(g):
+    """Play at the fastest spawn rate"""
+    g.difficulty['spawn_rate_start'] = g.difficulty['spawn_rate_min']
+    g.reset_game()
+
+
+def setup_flood(g):
+    """Hundreds of prey and thousands of particles on screen"""
+    g.reset_game()
+    top_up_flood(g)
+
+
+def top_up_flood(g):
+    """Keep the flood scenario at its target entity counts"""
+    while len(g.prey_group) < FLOOD_PREY:
+        prey = g.prey_pool.acquire(g.rng)
+        prey.x = prey.prev_x = g.rng.uniform(0, game.SCREEN_WIDTH)
+        prey.rect.x = prey.x
+        g.add_entity(prey, g.prey_group)
+    particles = len(g.particles) if g.particles is not None else len(g.particle_group)
+    while particles < FLOOD_PARTICLES:
+        g.spawn_particles(g.rng.uniform(0, game.SCREEN_WIDTH), g.rng.uniform(100, game.SCREEN_HEIGHT), game.GOLD, 50)
+        particles += 50
+
+
+SCENARIOS = {
+    'menu': (setup_menu, None),
+    'normal': (setup_normal, None),
+    'max_difficulty': (setup_max_difficulty, None),
+    'flood': (setup_flood, top_up_flood),
+}
+
+
+def run_frames(g, frames, maintain):
+    """Step and draw frames, returning (tick seconds, per-frame draw seconds)"""
+    tick_time = 0.0
+    draw_times = []
+    clock = time.perf_counter
+    for _ in range(frames):
+        if maintain:
+            maintain(g)
+        if g.state == game.PLAYING:
+            # Never lose, so every scenario keeps its load for the whole run
+            g.lives = 3
+            start = clock()
+            g.step(SCRIPT(g))
+            tick_time += clock() - start
+        start = clock()
+        g.draw()
+        draw_times.append(clock() - start)
+    return tick_time, draw_times
+
+
+def run_scenario(name, frames, warmup, seed, repeats):
+    """Measure one scenario on a fresh Game: median timings over the passes, and their spread"""
+    setup, maintain = SCENARIOS[name]
+    g = game.Game(seed=seed)
+    setup(g)
+    run_frames(g, warmup, maintain)
+    
+    passes = {'ticks_per_sec': [], 'draw_ms_mean': [], 'draw_ms_p95': []}
+    for _ in range(repeats):
+        tick_time, draw_times = run_frames(g, frames, maintain)
+        draw_times.sort()
+        if tick_time:
+            passes['ticks_per_sec'].append(frames / tick_time)
+        passes['draw_ms_mean'].append(sum(draw_times) / len(draw_times) * 1000)
+        passes['draw_ms_p95'].append(draw_times[int(len(draw_times) * 0.95)] * 1000)
+    
+    # Separate run for memory, since tracemalloc would skew the timings. It
+    # traces from construction so the peak covers the whole scenario.
+    tracemalloc.start()
+    g = game.Game(seed=seed)
+    setup(g)
+    run_frames(g, warmup + frames, maintain)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    metrics = {'peak_kib': peak / 1024}
+    noise = {}
+    for metric, values in passes.items():
+        median = statistics.median(values) if values else 0.0
+        metrics[metric] = median
+        # Relative run-to-run spread, used as a floor for the regression threshold
+        noise[metric] = (max(values) - min(values)) / median if median else 0.0
+    metrics['noise'] = noise
+    return metrics
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison table and return the list of regressions
+    
+    A timing only counts as regressed when it moved by more than both the
+    threshold and the run-to-run spread seen in either result.
+    """
+    regressions = []
+    print(f"\n{'scenario':<16} {'metric':<14} {'baseline':>12} {'current':>12} {'change':>8} {'allowed':>8}")
+    for name, metrics in results['scenarios'].items():
+        base = baseline['scenarios'].get(name)
+        if base is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = base.get(metric), metrics[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            allowed = max(threshold, base.get('noise', {}).get(metric, 0.0),
+                          metrics.get('noise', {}).get(metric, 0.0))
+            flag = ''
+            if worse > allowed:
+                flag = '  REGRESSION'
+                regressions.append((name, metric, old, new))
+            print(f"{name:<16} {metric:<14} {old:>12.2f} {new:>12.2f} {change:>+7.1%} {allowed:>7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="timing passes per scenario; the median is kept")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="bench_results.json",
+                        help="where to write this run's results")
+    parser.add_argument("--compare", metavar="BASELINE", default=None,
+                        help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change that counts as a regression (raised to the run-to-run spread)")
+    args = parser.parse_args()
+    
+    results = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': game.np.__version__ if game.np is not None else None,
+            'platform': platform.platform(),
+            'frames': args.frames,
+            'repeats': args.repeats,
+            'seed': args.seed,
+        },
+        'scenarios': {},
+    }
+    
+    print(f"{'scenario':<16} {'ticks/s':>10} {'draw ms':>9} {'draw p95':>9} {'peak KiB':>10}")
+    for name in args.scenarios:
+        metrics = run_scenario(name, args.frames, args.warmup, args.seed, args.repeats)
+        results['scenarios'][name] = metrics
+        print(f"{name:<16} {metrics['ticks_per_sec']:>10.0f} {metrics['draw_ms_mean']:>9.2f} "
+              f"{metrics['draw_ms_p95']:>9.2f} {metrics['peak_kib']:>10.0f}")
+    
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.out}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+        print("\nNo regressions")
+    
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Memory benchmark - windowed sprites vs headless entity records
+
+Spawns the same seeded mix of prey and trees (the default prey chance)
+through the game's own spawn path twice: in a windowed game, which
+simulates Prey / Obstacle sprites, and in a headless game, which simulates
+__slots__ EntityRecords holding a type id into ENTITY_TYPES. It reports the
+tracemalloc bytes per entity, including group bookkeeping and (with NumPy)
+the ScrollingStore columns the groups move onto, plus the cost of one
+scrolling tick over all of them. Shared type images are drawn before
+tracing starts, as they would be in a running game, so only per-entity
+memory is counted.
+
+Usage:
+    python benchmarks/bench_memory.py --entities 100000
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+
+import jaguar_game_python as game
+
+
+def make_game(headless, seed):
+    """A game ready to spawn into: sprites offscreen, or records headless"""
+    if headless:
+        g = game.Game(headless=True, seed=seed, snapshot_interval=0)
+    else:
+        g = game.Game(seed=seed, snapshot_interval=0,
+                      screen=pygame.Surface((game.SCREEN_WIDTH, game.SCREEN_HEIGHT)))
+    # Draw and cache every shared type image and mask up front
+    rng = random.Random(seed)
+    for name in game.Prey.types:
+        prey = game.Prey(rng)
+        prey.type = name
+        prey.load_image()
+    game.Obstacle(rng)
+    # One spawn per spawn_entities() call
+    g.spawn_rate = 1
+    return g
+
+
+def measure(headless, count, seed, ticks):
+    """Bytes per entity while alive, peak bytes per entity while spawning, and ms per tick"""
+    g = make_game(headless, seed)
+    gc.collect()
+    tracemalloc.start()
+    for _ in range(count):
+        g.spawn_entities()
+    # The first tick moves large groups onto their arrays
+    g.update_entities()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    start = time.perf_counter()
+    for _ in range(ticks):
+        g.update_entities()
+    tick_ms = (time.perf_counter() - start) / ticks * 1000
+    return current / count, peak / count, tick_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entities", type=int, nargs="+", default=[100000])
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    if game.np is None:
+        print("NumPy is not installed; groups stay per-object, without ScrollingStore columns")
+    
+    print(f"{'entities':>8} {'layout':<8} {'B/entity':>9} {'peak B/entity':>14} {'MiB':>7} {'tick ms':>8}")
+    for count in args.entities:
+        for name, headless in (('sprites', False), ('records', True)):
+            per_entity, peak, tick_ms = measure(headless, count, args.seed, args.ticks)
+            print(f"{count:>8} {name:<8} {per_entity:>9.0f} {peak:>14.0f} "
+                  f"{per_entity * count / 2 ** 20:>7.1f} {tick_ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Particle benchmark - Particle sprites vs the NumPy ParticleSystem
+
+Keeps a steady population of live particles alive for a number of frames
+and reports the average update + draw cost per frame for both paths.
+
+Usage:
+    python benchmarks/bench_particles.py --particles 10000 --frames 300
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+
+import jaguar_game_python as game
+
+# Same burst size as a catch
+BURST = 15
+
+
+def bench_sprites(screen, live, frames):
+    """Average ms per frame for the Particle sprite path"""
+    group = pygame.sprite.Group()
+    total = 0.0
+    for frame in range(frames):
+        start = time.perf_counter()
+        while len(group) < live:
+            for _ in range(BURST):
+                group.add(game.Particle(game.SCREEN_WIDTH // 2, game.SCREEN_HEIGHT // 2, game.GOLD))
+        group.update()
+        group.draw(screen)
+        total += time.perf_counter() - start
+    return total / frames * 1000
+
+
+def bench_numpy(screen, live, frames):
+    """Average ms per frame for the ParticleSystem path"""
+    particles = game.ParticleSystem(capacity=max(game.PARTICLE_CAPACITY, live + BURST), seed=0)
+    total = 0.0
+    for frame in range(frames):
+        start = time.perf_counter()
+        while len(particles) < live:
+            particles.emit(game.SCREEN_WIDTH // 2, game.SCREEN_HEIGHT // 2, game.GOLD, BURST)
+        particles.update()
+        particles.draw(screen)
+        total += time.perf_counter() - start
+    return total / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--particles", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+    
+    pygame.display.init()
+    screen = pygame.display.set_mode((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+    
+    if game.np is None:
+        print("NumPy is not installed; only the sprite path can be measured")
+    
+    print(f"{'live':>8} {'sprites ms':>12} {'numpy ms':>10} {'speedup':>8}")
+    for live in args.particles:
+        sprite_ms = bench_sprites(screen, live, args.frames)
+        if game.np is None:
+            print(f"{live:>8} {sprite_ms:>12.3f} {'-':>10} {'-':>8}")
+            continue
+        numpy_ms = bench_numpy(screen, live, args.frames)
+        print(f"{live:>8} {sprite_ms:>12.3f} {numpy_ms:>10.3f} {sprite_ms / numpy_ms:>7.1f}x")
+    
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
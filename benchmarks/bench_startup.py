@@ -0,0 +1,59 @@
+"""
+Startup benchmark - import time and time to first frame in fresh interpreters
+
+Each run starts a new Python process so module import cost is measured cold
+(as the launcher and tooling see it), then constructs a Game and presents
+one menu frame on the SDL dummy video driver.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Runs inside the child process; prints the game's startup timings as JSON
+CHILD = """
+import json, os, sys
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, {root!r})
+import jaguar_game_python as game
+g = game.Game(headless={headless})
+g.draw()
+print(json.dumps(g.startup))
+"""
+
+
+def run_child(headless):
+    """Startup timings from one fresh interpreter"""
+    code = CHILD.format(root=ROOT, headless=headless)
+    output = subprocess.run([sys.executable, "-c", code], check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    
+    print(f"{'mode':<10} {'import ms':>10} {'Game() ms':>10} {'first frame ms':>15}")
+    for headless in (True, False):
+        runs = [run_child(headless) for _ in range(args.runs)]
+        import_ms = statistics.median(r['import_ms'] for r in runs)
+        init_ms = statistics.median(r['init_ms'] for r in runs)
+        first_frame = '-'
+        if not headless:
+            first_frame = f"{statistics.median(r['first_frame_ms'] for r in runs):.1f}"
+        mode = 'headless' if headless else 'window'
+        print(f"{mode:<10} {import_ms:>10.1f} {init_ms:>10.1f} {first_frame:>15}")
+
+
+if __name__ == "__main__":
+    main()
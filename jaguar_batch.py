@@ -0,0 +1,225 @@
+"""
+Jaguar Hunt - Monte Carlo batch runner for difficulty tuning
+
+Runs many seeded headless sessions with a bot policy across a process pool
+and writes per-combination score / survival distributions to CSV or JSON.
+
+Usage:
+    python jaguar_batch.py --sessions 200 --out results.csv
+    python jaguar_batch.py --sessions 100 --param spawn_rate_min=20,30,40 \\
+        --param spawn_rate_step=1,2 --out sweep.json --sessions-out sessions.jsonl
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import jaguar_game_python as jg
+
+# Per-session metrics that get aggregated into distributions
+METRICS = ['ticks', 'score', 'lives_lost', 'peak_prey', 'peak_obstacles']
+
+
+def idle_policy(game):
+    """Never move or pounce"""
+    return 0
+
+
+def hunter_policy(game):
+    """Dodge trees in the jaguar's lane, otherwise chase and pounce the nearest prey"""
+    jaguar = game.jaguar
+    rect = jaguar.rect
+    centery = rect.centery
+    
+    # Dodge: a tree is about to reach us and overlaps our row
+    for obstacle in game.obstacle_group:
+        gap = obstacle.rect.left - rect.right
+        overlaps_row = obstacle.rect.top - 10 < rect.bottom and rect.top < obstacle.rect.bottom + 10
+        if -obstacle.rect.width - rect.width < gap < 120 and overlaps_row:
+            room_above = obstacle.rect.top - 50
+            room_below = jg.SCREEN_HEIGHT - 50 - obstacle.rect.bottom
+            return jg.INPUT_UP if room_above > room_below else jg.INPUT_DOWN
+    
+    # Chase: nearest prey still in front of us
+    target = None
+    best = None
+    for prey in game.prey_group:
+        if prey.rect.right < rect.left:
+            continue
+        distance = abs(prey.rect.centerx - rect.centerx) + abs(prey.rect.centery - centery)
+        if best is None or distance < best:
+            target, best = prey, distance
+    
+    if target is None:
+        return jg.INPUT_LEFT if rect.x > 150 else 0
+    
+    mask = 0
+    if target.rect.centery < centery - 4:
+        mask |= jg.INPUT_UP
+    elif target.rect.centery > centery + 4:
+        mask |= jg.INPUT_DOWN
+    if target.rect.centerx > rect.centerx + 80:
+        mask |= jg.INPUT_RIGHT
+    if best < 60:
+        mask |= jg.INPUT_POUNCE
+    return mask
+
+
+POLICIES = {
+    'idle': idle_policy,
+    'hunter': hunter_policy,
+}
+
+
+def run_sessions(task):
+    """Worker entry point: run a chunk of seeded sessions for one parameter combination"""
+    combo_index, difficulty, seeds, max_ticks, policy_name = task
+    policy = POLICIES[policy_name]
+    results = []
+    for seed in seeds:
+        game = jg.Game(headless=True, seed=seed, difficulty=difficulty)
+        result = game.run_headless(max_ticks, policy)
+        result['combo'] = combo_index
+        results.append(result)
+    return results
+
+
+def parse_param(text):
+    """Parse NAME=V1,V2,... into (name, [values])"""
+    name, _, values = text.partition('=')
+    if name not in jg.DIFFICULTY or not values:
+        raise argparse.ArgumentTypeError(
+            f"expected NAME=V1,V2,... with NAME one of {', '.join(jg.DIFFICULTY)}")
+    cast = type(jg.DIFFICULTY[name])
+    return name, [cast(value) for value in values.split(',')]
+
+
+def build_combinations(params):
+    """Cartesian product of the swept parameters as difficulty override dicts"""
+    if not params:
+        return [{}]
+    names = [name for name, _ in params]
+    return [dict(zip(names, values)) for values in itertools.product(*(v for _, v in params))]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(values):
+    """Distribution summary for one metric"""
+    ordered = sorted(values)
+    return {
+        'mean': statistics.fmean(ordered),
+        'stdev': statistics.pstdev(ordered),
+        'min': ordered[0],
+        'p10': percentile(ordered, 0.10),
+        'p50': percentile(ordered, 0.50),
+        'p90': percentile(ordered, 0.90),
+        'max': ordered[-1],
+    }
+
+
+def aggregate(combos, results):
+    """Group session results by combination and summarize each metric"""
+    by_combo = {index: [] for index in range(len(combos))}
+    for result in results:
+        by_combo[result['combo']].append(result)
+    
+    rows = []
+    for index, difficulty in enumerate(combos):
+        sessions = by_combo[index]
+        row = {'combo': index, 'sessions': len(sessions)}
+        row.update(dict(jg.DIFFICULTY, **difficulty))
+        row['game_over_rate'] = sum(r['game_over'] for r in sessions) / len(sessions)
+        for metric in METRICS:
+            for stat, value in summarize([r[metric] for r in sessions]).items():
+                row[f"{metric}_{stat}"] = value
+        rows.append(row)
+    return rows
+
+
+def write_rows(rows, path):
+    """Write aggregated rows as CSV or JSON depending on the extension"""
+    if path.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump(rows, f, indent=2)
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jaguar Hunt Monte Carlo batch runner")
+    parser.add_argument("--sessions", type=int, default=100,
+                        help="seeded sessions per parameter combination")
+    parser.add_argument("--max-ticks", type=int, default=jg.FPS * 60 * 10,
+                        help="tick cap per session (default: 10 minutes)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default='hunter')
+    parser.add_argument("--param", type=parse_param, action='append', default=[],
+                        help="difficulty parameter to sweep, e.g. spawn_rate_min=20,30")
+    parser.add_argument("--seed", type=int, default=0, help="first session seed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=10,
+                        help="sessions per worker task")
+    parser.add_argument("--out", default="batch_results.csv",
+                        help="aggregated output (.csv or .json)")
+    parser.add_argument("--sessions-out", default=None,
+                        help="optional JSON-lines file streaming every session result")
+    args = parser.parse_args()
+    
+    combos = build_combinations(args.param)
+    
+    # Every combination sees the same seeds so differences come from the parameters
+    seeds = list(range(args.seed, args.seed + args.sessions))
+    tasks = []
+    for index, difficulty in enumerate(combos):
+        for start in range(0, len(seeds), args.chunk):
+            tasks.append((index, difficulty, seeds[start:start + args.chunk],
+                          args.max_ticks, args.policy))
+    
+    total = len(combos) * len(seeds)
+    print(f"{len(combos)} combination(s) x {len(seeds)} sessions on {args.workers} workers")
+    
+    results = []
+    stream = open(args.sessions_out, 'w') if args.sessions_out else None
+    start_time = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [executor.submit(run_sessions, task) for task in tasks]
+            for future in as_completed(futures):
+                chunk = future.result()
+                results.extend(chunk)
+                if stream:
+                    for result in chunk:
+                        stream.write(json.dumps(result) + "\n")
+                    stream.flush()
+                print(f"\r{len(results)}/{total} sessions", end='', file=sys.stderr)
+    finally:
+        if stream:
+            stream.close()
+    elapsed = time.perf_counter() - start_time
+    print(file=sys.stderr)
+    
+    rows = aggregate(combos, results)
+    write_rows(rows, args.out)
+    
+    ticks = sum(r['ticks'] for r in results)
+    print(f"{total} sessions, {ticks} ticks in {elapsed:.1f}s "
+          f"({total / elapsed:.1f} sessions/s, {ticks / elapsed:,.0f} ticks/s, "
+          f"{ticks / jg.FPS / 60 / elapsed * 60:,.0f} simulated min per wall min)")
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
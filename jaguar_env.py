@@ -0,0 +1,359 @@
+"""
+Jaguar Hunt - Gym-style environments for training agents
+
+JaguarEnv wraps one Game behind reset() / step() with a discrete action
+space. Observations are either the rendered frame, as an array that shares
+memory with the surface the game draws into (no copy per step), or a compact
+feature vector of entity positions. VectorEnv steps several environments in
+lockstep in this process; ProcessVectorEnv spreads them over worker processes
+that write observations straight into shared memory.
+
+Requires NumPy.
+
+Usage:
+    python jaguar_env.py --envs 8 --obs features --steps 2000
+    python jaguar_env.py --envs 8 --obs pixels --downsample 4 --workers 4
+"""
+
+import argparse
+import heapq
+import os
+import time
+from multiprocessing import Pipe, Process, shared_memory
+
+import numpy as np
+import pygame
+
+import jaguar_game_python as jg
+
+# Every movement direction (or none), with and without a pounce
+MOVES = [
+    0,
+    jg.INPUT_UP,
+    jg.INPUT_DOWN,
+    jg.INPUT_LEFT,
+    jg.INPUT_RIGHT,
+    jg.INPUT_UP | jg.INPUT_LEFT,
+    jg.INPUT_UP | jg.INPUT_RIGHT,
+    jg.INPUT_DOWN | jg.INPUT_LEFT,
+    jg.INPUT_DOWN | jg.INPUT_RIGHT,
+]
+ACTIONS = MOVES + [move | jg.INPUT_POUNCE for move in MOVES]
+
+# Nearest entities of each kind in the feature vector, as (dx, dy, present)
+FEATURE_PREY = 5
+FEATURE_OBSTACLES = 5
+FEATURE_SIZE = 4 + 3 * (FEATURE_PREY + FEATURE_OBSTACLES)
+
+# Reward lost with each life, on top of the score delta
+LIFE_PENALTY = 50
+
+# Seeded environments in a vector are this many sessions apart, so their
+# episodes never replay each other
+ENV_SEED_STRIDE = 1_000_000
+
+
+def observation_spec(obs='features', downsample=1):
+    """Shape and dtype of one observation"""
+    if obs == 'features':
+        return (FEATURE_SIZE,), np.float32
+    if obs == 'pixels':
+        height = -(-jg.SCREEN_HEIGHT // downsample)
+        width = -(-jg.SCREEN_WIDTH // downsample)
+        return (height, width, 3), np.uint8
+    raise ValueError(f"unknown observation type {obs!r}")
+
+
+class JaguarEnv:
+    """One game behind a reset() / step() interface
+    
+    Observations are views the environment overwrites on the next step;
+    copy them to keep one. Full-size pixel observations can be rendered
+    straight into a caller's (height, width, 3) array passed as out.
+    """
+    def __init__(self, obs='features', downsample=1, frame_skip=1, max_ticks=jg.FPS * 60 * 5,
+                 life_penalty=LIFE_PENALTY, seed=None, difficulty=None, out=None):
+        self.obs = obs
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.life_penalty = life_penalty
+        self.action_count = len(ACTIONS)
+        self.observation_shape, self.observation_dtype = observation_spec(obs, downsample)
+        
+        if obs == 'pixels':
+            # The game draws straight into this array's memory. pixels3d would
+            # lock the surface and stop blits while the view is alive.
+            size = (jg.SCREEN_WIDTH, jg.SCREEN_HEIGHT)
+            if downsample == 1:
+                # Packed RGB, so the frame itself is the observation
+                self.frame = out if out is not None else np.zeros(self.observation_shape, dtype=np.uint8)
+                screen = pygame.image.frombuffer(self.frame, size, 'RGB')
+                self.pixels = self.frame
+            else:
+                self.frame = np.zeros((jg.SCREEN_HEIGHT, jg.SCREEN_WIDTH, 4), dtype=np.uint8)
+                screen = pygame.image.frombuffer(self.frame, size, 'RGBX')
+                self.pixels = self.frame[::downsample, ::downsample, :3]
+            self.game = jg.Game(seed=seed, difficulty=difficulty, snapshot_interval=0, screen=screen)
+        else:
+            self.game = jg.Game(headless=True, seed=seed, difficulty=difficulty, snapshot_interval=0)
+            self.features = np.zeros(FEATURE_SIZE, dtype=np.float32)
+    
+    def reset(self, seed=None):
+        """Start a new episode, returning (observation, info)"""
+        game = self.game
+        if seed is not None:
+            game.seed = seed
+            game.sessions_started = 0
+        game.reset_game()
+        return self.observe(), self.info()
+    
+    def step(self, action):
+        """Apply an action index for frame_skip ticks
+        
+        Returns (observation, reward, terminated, truncated, info).
+        """
+        game = self.game
+        mask = ACTIONS[action]
+        score, lives = game.score, game.lives
+        for _ in range(self.frame_skip):
+            game.step(mask)
+            if game.state != jg.PLAYING:
+                break
+        reward = (game.score - score) - self.life_penalty * (lives - game.lives)
+        terminated = game.state == jg.GAME_OVER
+        truncated = not terminated and game.ticks >= self.max_ticks
+        return self.observe(), float(reward), terminated, truncated, self.info()
+    
+    def info(self):
+        """Episode progress reported alongside each observation"""
+        game = self.game
+        return {'score': game.score, 'lives': game.lives, 'ticks': game.ticks,
+                'session_seed': game.session_seed}
+    
+    def observe(self):
+        """Current observation"""
+        if self.obs == 'pixels':
+            self.game.alpha = 1.0
+            self.game.draw()
+            return self.pixels
+        return self.observe_features()
+    
+    def observe_features(self):
+        """Jaguar position and pounce state, then the nearest prey and trees relative to it"""
+        jaguar = self.game.jaguar
+        features = self.features
+        features.fill(0.0)
+        jx, jy = jaguar.rect.center
+        features[0] = jx / jg.SCREEN_WIDTH
+        features[1] = jy / jg.SCREEN_HEIGHT
+        features[2] = jaguar.pouncing
+        features[3] = jaguar.pounce_cooldown / 30
+        self.fill_nearest(self.game.prey_group, FEATURE_PREY, 4, jx, jy)
+        self.fill_nearest(self.game.obstacle_group, FEATURE_OBSTACLES, 4 + 3 * FEATURE_PREY, jx, jy)
+        return features
+    
+    def fill_nearest(self, group, count, offset, jx, jy):
+        """Write the count nearest sprites of a group as (dx, dy, 1) triples"""
+        deltas = ((x - jx, y - jy) for x, y in group.centers())
+        nearest = heapq.nsmallest(count, deltas, key=lambda d: abs(d[0]) + abs(d[1]))
+        features = self.features
+        for dx, dy in nearest:
+            features[offset] = dx / jg.SCREEN_WIDTH
+            features[offset + 1] = dy / jg.SCREEN_HEIGHT
+            features[offset + 2] = 1.0
+            offset += 3
+
+
+class VectorEnv:
+    """Several environments stepped in lockstep in this process
+    
+    Finished environments reset themselves; their last info is kept under
+    'final' in the info of the step that ended them.
+    """
+    def __init__(self, count, seed=None, first_index=0, out=None, **env_kwargs):
+        shape, dtype = observation_spec(env_kwargs.get('obs', 'features'), env_kwargs.get('downsample', 1))
+        self.observations = out if out is not None else np.zeros((count,) + shape, dtype=dtype)
+        # Full-size frames are drawn straight into their row of the batch
+        self.in_place = env_kwargs.get('obs') == 'pixels' and env_kwargs.get('downsample', 1) == 1
+        self.envs = []
+        for index in range(first_index, first_index + count):
+            env_seed = None if seed is None else seed + index * ENV_SEED_STRIDE
+            row = self.observations[index - first_index] if self.in_place else None
+            self.envs.append(JaguarEnv(seed=env_seed, out=row, **env_kwargs))
+        self.rewards = np.zeros(count, dtype=np.float32)
+        self.terminated = np.zeros(count, dtype=bool)
+        self.truncated = np.zeros(count, dtype=bool)
+    
+    def __len__(self):
+        return len(self.envs)
+    
+    def reset(self, seed=None):
+        """Reset every environment, returning (observations, infos)"""
+        infos = []
+        for index, env in enumerate(self.envs):
+            env_seed = None if seed is None else seed + index * ENV_SEED_STRIDE
+            observation, info = env.reset(env_seed)
+            if not self.in_place:
+                self.observations[index] = observation
+            infos.append(info)
+        return self.observations, infos
+    
+    def step(self, actions):
+        """Step every environment with its action
+        
+        Returns (observations, rewards, terminated, truncated, infos); the
+        arrays are reused by the next step.
+        """
+        infos = []
+        for index, env in enumerate(self.envs):
+            observation, reward, terminated, truncated, info = env.step(actions[index])
+            if terminated or truncated:
+                observation, reset_info = env.reset()
+                reset_info['final'] = info
+                info = reset_info
+            if not self.in_place:
+                self.observations[index] = observation
+            self.rewards[index] = reward
+            self.terminated[index] = terminated
+            self.truncated[index] = truncated
+            infos.append(info)
+        return self.observations, self.rewards, self.terminated, self.truncated, infos
+    
+    def close(self):
+        pass
+
+
+def worker_main(conn, memory_name, shape, dtype, start, stop, seed, env_kwargs):
+    """Worker process entry point: host a slice of the environments"""
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        observations = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+        envs = VectorEnv(stop - start, seed=seed, first_index=start,
+                         out=observations[start:stop], **env_kwargs)
+        while True:
+            command, data = conn.recv()
+            if command == 'step':
+                conn.send(envs.step(data)[1:])
+            elif command == 'reset':
+                conn.send(envs.reset(None if data is None else data + start * ENV_SEED_STRIDE)[1])
+            elif command == 'close':
+                break
+        del observations, envs
+    finally:
+        memory.close()
+        conn.close()
+
+
+class ProcessVectorEnv:
+    """VectorEnv spread over worker processes
+    
+    Observations land in one shared memory block, so only actions, rewards
+    and infos cross the pipes.
+    """
+    def __init__(self, count, workers=None, seed=None, **env_kwargs):
+        workers = max(1, min(count, workers or os.cpu_count()))
+        shape, dtype = observation_spec(env_kwargs.get('obs', 'features'), env_kwargs.get('downsample', 1))
+        shape = (count,) + shape
+        dtype = np.dtype(dtype)
+        self.memory = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * dtype.itemsize)
+        self.observations = np.ndarray(shape, dtype=dtype, buffer=self.memory.buf)
+        
+        # Contiguous slices, as even as possible
+        bounds = [count * i // workers for i in range(workers + 1)]
+        self.slices = list(zip(bounds, bounds[1:]))
+        self.conns = []
+        self.processes = []
+        for start, stop in self.slices:
+            parent, child = Pipe()
+            process = Process(target=worker_main, daemon=True,
+                              args=(child, self.memory.name, shape, dtype, start, stop, seed, env_kwargs))
+            process.start()
+            child.close()
+            self.conns.append(parent)
+            self.processes.append(process)
+        self.closed = False
+    
+    def __len__(self):
+        return len(self.observations)
+    
+    def reset(self, seed=None):
+        """Reset every environment, returning (observations, infos)"""
+        for conn in self.conns:
+            conn.send(('reset', seed))
+        infos = []
+        for conn in self.conns:
+            infos.extend(conn.recv())
+        return self.observations, infos
+    
+    def step(self, actions):
+        """Step every environment with its action; see VectorEnv.step"""
+        for conn, (start, stop) in zip(self.conns, self.slices):
+            conn.send(('step', list(actions[start:stop])))
+        rewards, terminated, truncated, infos = [], [], [], []
+        for conn in self.conns:
+            chunk_rewards, chunk_terminated, chunk_truncated, chunk_infos = conn.recv()
+            rewards.append(chunk_rewards)
+            terminated.append(chunk_terminated)
+            truncated.append(chunk_truncated)
+            infos.extend(chunk_infos)
+        return (self.observations, np.concatenate(rewards), np.concatenate(terminated),
+                np.concatenate(truncated), infos)
+    
+    def close(self):
+        """Stop the workers and release the shared memory"""
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self.conns:
+            conn.send(('close', None))
+        for process in self.processes:
+            process.join()
+        for conn in self.conns:
+            conn.close()
+        del self.observations
+        self.memory.close()
+        self.memory.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jaguar Hunt environment throughput check")
+    parser.add_argument("--envs", type=int, default=8)
+    parser.add_argument("--obs", choices=['features', 'pixels'], default='features')
+    parser.add_argument("--downsample", type=int, default=1)
+    parser.add_argument("--frame-skip", type=int, default=1)
+    parser.add_argument("--steps", type=int, default=1000, help="vector steps to run")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="worker processes (0 steps every environment in this process)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    env_kwargs = {'obs': args.obs, 'downsample': args.downsample, 'frame_skip': args.frame_skip}
+    if args.workers:
+        envs = ProcessVectorEnv(args.envs, workers=args.workers, seed=args.seed, **env_kwargs)
+    else:
+        envs = VectorEnv(args.envs, seed=args.seed, **env_kwargs)
+    
+    rng = np.random.default_rng(args.seed)
+    try:
+        envs.reset()
+        episodes = 0
+        total_reward = 0.0
+        start_time = time.perf_counter()
+        for _ in range(args.steps):
+            actions = rng.integers(len(ACTIONS), size=args.envs)
+            _, rewards, terminated, truncated, _ = envs.step(actions)
+            episodes += int(terminated.sum() + truncated.sum())
+            total_reward += float(rewards.sum())
+        elapsed = time.perf_counter() - start_time
+    finally:
+        envs.close()
+    
+    steps = args.steps * args.envs
+    shape, _ = observation_spec(args.obs, args.downsample)
+    print(f"{steps} env steps in {elapsed:.2f}s ({steps / elapsed:,.0f} steps/s, "
+          f"{steps * args.frame_skip / elapsed:,.0f} ticks/s), observation {shape}, "
+          f"{episodes} episodes, mean reward {total_reward / steps:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,20 +11,40 @@ Controls:
 Objective: Hunt prey, avoid obstacles, survive as long as possible!
 """
 
-import pygame
-import random
-import math
-import sys
+import time
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
+# Taken before the other imports so startup reports include them; the imports
+# below follow it on purpose, hence their noqa markers
+IMPORT_STARTED = time.perf_counter()
+
+import argparse  # noqa: E402
+import gzip  # noqa: E402
+import json  # noqa: E402
+import os  # noqa: E402
+import pygame  # noqa: E402
+import queue  # noqa: E402
+import random  # noqa: E402
+import math  # noqa: E402
+import struct  # noqa: E402
+import sys  # noqa: E402
+import threading  # noqa: E402
+import weakref  # noqa: E402
+from collections import OrderedDict, deque  # noqa: E402
+
+try:
+    import numpy as np  # noqa: E402
+except ImportError:  # NumPy is optional; particles fall back to sprites
+    np = None
 
 # Constants
 SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 700
 FPS = 60
 
+# Fixed simulation rate; movement speeds and timers are tuned per tick at 60 Hz
+TICK_RATE = 60
+MAX_CATCHUP_STEPS = 5
+
 # Colors
 SKY_BLUE = (135, 206, 235)
 GRASS_GREEN = (34, 139, 34)
@@ -38,6 +58,89 @@ RED = (255, 0, 0)
 GOLD = (255, 215, 0)
 ORANGE = (255, 165, 0)
 
+# Sprite atlas
+TAIL_PHASE_BUCKETS = 16
+
+# Particles
+PARTICLE_CAPACITY = 16384
+
+# Rendered text surfaces kept by the text cache
+TEXT_CACHE_SIZE = 128
+
+# World render resolutions F5 cycles through, as a fraction of the window
+RENDER_SCALES = (1.0, 0.75, 0.5)
+
+# Broadphase grid cell size in pixels
+SPATIAL_CELL_SIZE = 100
+# Groups keep a spatial hash only with at least this many members and this
+# many collision queries per tick (dropping it below half of either).
+# Re-bucketing costs about 12x a linear rect test per member, so with the
+# game's one query per group per tick the linear test wins at any size.
+SPATIAL_HASH_MIN = 32
+SPATIAL_HASH_QUERIES = 12
+
+# Initial slots in the scrolling entity arrays (grown on demand)
+SCROLLING_CAPACITY = 256
+# Scrolling groups switch to batched NumPy movement at this many members
+# (and back below half of it); smaller groups are cheaper per sprite
+SCROLLING_VECTOR_MIN = 64
+
+# Frames kept by the profiler ring buffer
+PROFILE_FRAMES = 600
+
+# Rewind: a snapshot every second, half a minute of history
+SNAPSHOT_INTERVAL = 60
+SNAPSHOT_RING_SIZE = 30
+REWIND_SECONDS = 10
+
+# Telemetry: events buffered between the game and the writer thread, events
+# written per batch, and how often the compressed stream is flushed to disk
+TELEMETRY_QUEUE_SIZE = 8192
+TELEMETRY_BATCH_SIZE = 512
+TELEMETRY_FLUSH_SECONDS = 2.0
+
+# Effects quality levels, lowest first: share of particles per burst,
+# pounce glow and HUD text shadows
+QUALITY_LEVELS = (
+    {'name': 'low', 'particles': 0.25, 'glow': False, 'shadows': False},
+    {'name': 'medium', 'particles': 0.5, 'glow': True, 'shadows': False},
+    {'name': 'high', 'particles': 1.0, 'glow': True, 'shadows': True},
+)
+
+# Frame-budget governor: frames per decision, over-budget frames in one window
+# that drop a level, and calm windows (slowest frame within the headroom share
+# of the budget) in a row needed to raise one
+GOVERNOR_WINDOW = 30
+GOVERNOR_DOWNGRADE_MISSES = 5
+GOVERNOR_UPGRADE_HEADROOM = 0.6
+GOVERNOR_UPGRADE_WINDOWS = 4
+
+# Entities allocated up front by the spawn pools
+PREY_POOL_PREWARM = 16
+OBSTACLE_POOL_PREWARM = 8
+PARTICLE_POOL_PREWARM = 256
+
+# Difficulty curve (overridable per Game for tuning runs)
+DIFFICULTY = {
+    'spawn_rate_start': 60,     # ticks between spawns at the start
+    'spawn_rate_min': 30,       # fastest spawn rate
+    'spawn_rate_step': 2,       # spawn rate decrease per difficulty bump
+    'difficulty_interval': 300, # ticks between difficulty bumps
+    'prey_chance': 0.7,         # chance a spawn is prey rather than a tree
+}
+
+# Simulation input bits
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_UP = 4
+INPUT_DOWN = 8
+INPUT_POUNCE = 16
+
+# Replay file format
+REPLAY_MAGIC = b'JGRP'
+REPLAY_VERSION = 1
+REPLAY_HEADER = struct.Struct('<4sBqHH')  # magic, version, seed, tick rate, difficulty JSON length
+
 # Game States
 MENU = 0
 PLAYING = 1
@@ -45,89 +148,160 @@ PAUSED = 2
 GAME_OVER = 3
 
 
-class Jaguar(pygame.sprite.Sprite):
-    """The player-controlled jaguar"""
+class JaguarAtlas:
+    """Pre-rendered jaguar frames keyed by (facing_right, pouncing, tail bucket)"""
     
-    def __init__(self, x, y):
-        super().__init__()
-        self.width = 60
-        self.height = 50
-        self.x = x
-        self.y = y
-        self.speed = 6
-        self.dx = 0
-        self.dy = 0
-        self.pouncing = False
-        self.pounce_timer = 0
-        self.pounce_cooldown = 0
-        self.facing_right = True
-        self.animation_frame = 0
-        self.animation_speed = 0.2
-        
-        # Create surface
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        self.rect = self.image.get_rect()
-        self.rect.x = self.x
-        self.rect.y = self.y
-        
-        self.draw_jaguar()
+    def __init__(self, width, height, tail_buckets=TAIL_PHASE_BUCKETS):
+        self.width = width
+        self.height = height
+        self.tail_buckets = max(1, int(tail_buckets))
+        # Pouncing poses are drawn without their glow when this is off
+        self.glow = True
+        self.frames = {}
+        self.masks = {}
+        self.hits = 0
+        self.misses = 0
     
-    def draw_jaguar(self):
-        """Draw the jaguar sprite"""
-        self.image.fill((0, 0, 0, 0))
+    def bucket_for(self, animation_frame):
+        """Map a continuous animation phase onto a tail bucket"""
+        phase = animation_frame % (2 * math.pi)
+        return int(phase / (2 * math.pi) * self.tail_buckets) % self.tail_buckets
+    
+    def get_frame(self, facing_right, pouncing, bucket):
+        """Return the cached frame for a pose, rendering it on first use"""
+        glow = pouncing and self.glow
+        key = (facing_right, pouncing, bucket, glow)
+        frame = self.frames.get(key)
+        if frame is None:
+            self.misses += 1
+            frame = self.render_frame(facing_right, pouncing, bucket, glow)
+            self.frames[key] = frame
+        else:
+            self.hits += 1
+        return frame
+    
+    def mask_for(self, frame):
+        """Collision mask of a frame, built once; the faint pounce glow doesn't count"""
+        mask = self.masks.get(frame)
+        if mask is None:
+            mask = self.masks[frame] = pygame.mask.from_surface(frame)
+        return mask
+    
+    def prerender(self):
+        """Render every pose up front so gameplay never hits a miss"""
+        for facing_right in (True, False):
+            for pouncing in (False, True):
+                for bucket in range(self.tail_buckets):
+                    glow = pouncing and self.glow
+                    key = (facing_right, pouncing, bucket, glow)
+                    if key not in self.frames:
+                        self.frames[key] = self.render_frame(facing_right, pouncing, bucket, glow)
+    
+    def stats(self):
+        """Atlas hit/miss counters"""
+        return {'hits': self.hits, 'misses': self.misses, 'frames': len(self.frames)}
+    
+    def render_frame(self, facing_right, pouncing, bucket, glow=True):
+        """Draw the jaguar sprite for one pose"""
+        image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         
         # Pounce effect
-        if self.pouncing:
+        if pouncing:
             color = ORANGE
+        else:
+            color = JAGUAR_YELLOW
+        if pouncing and glow:
             glow_surface = pygame.Surface((self.width + 20, self.height + 20), pygame.SRCALPHA)
             pygame.draw.circle(glow_surface, (255, 215, 0, 100), 
                              (self.width // 2 + 10, self.height // 2 + 10), 40)
-            self.image.blit(glow_surface, (-10, -10))
-        else:
-            color = JAGUAR_YELLOW
+            image.blit(glow_surface, (-10, -10))
         
         # Body
         body_rect = pygame.Rect(10, 15, 40, 25)
-        pygame.draw.ellipse(self.image, color, body_rect)
+        pygame.draw.ellipse(image, color, body_rect)
         
         # Spots
         spot_positions = [(15, 20), (25, 18), (35, 22), (20, 28), (30, 30)]
         for pos in spot_positions:
-            pygame.draw.circle(self.image, JAGUAR_SPOT, pos, 3)
+            pygame.draw.circle(image, JAGUAR_SPOT, pos, 3)
         
         # Head
-        head_x = 45 if self.facing_right else 15
-        pygame.draw.circle(self.image, color, (head_x, 25), 12)
+        head_x = 45 if facing_right else 15
+        pygame.draw.circle(image, color, (head_x, 25), 12)
         
         # Eyes
-        eye_offset = 3 if self.facing_right else -3
-        pygame.draw.circle(self.image, BLACK, (head_x + eye_offset, 23), 2)
+        eye_offset = 3 if facing_right else -3
+        pygame.draw.circle(image, BLACK, (head_x + eye_offset, 23), 2)
         
         # Ears
-        ear_offset = 5 if self.facing_right else -5
-        pygame.draw.polygon(self.image, color, 
+        ear_offset = 5 if facing_right else -5
+        pygame.draw.polygon(image, color, 
                           [(head_x + ear_offset, 15), 
                            (head_x + ear_offset + 3, 10), 
                            (head_x + ear_offset + 6, 15)])
         
-        # Tail (animated)
-        tail_start_x = 10 if self.facing_right else 50
-        tail_wave = math.sin(self.animation_frame) * 5
+        # Tail (animated, sampled at the bucket centre)
+        tail_start_x = 10 if facing_right else 50
+        phase = (bucket + 0.5) * 2 * math.pi / self.tail_buckets
+        tail_wave = math.sin(phase) * 5
         tail_points = [
             (tail_start_x, 28),
-            (tail_start_x - 15 if self.facing_right else tail_start_x + 15, 25 + tail_wave),
-            (tail_start_x - 25 if self.facing_right else tail_start_x + 25, 30 + tail_wave)
+            (tail_start_x - 15 if facing_right else tail_start_x + 15, 25 + tail_wave),
+            (tail_start_x - 25 if facing_right else tail_start_x + 25, 30 + tail_wave)
         ]
-        pygame.draw.lines(self.image, color, False, tail_points, 4)
+        pygame.draw.lines(image, color, False, tail_points, 4)
         
         # Legs (simple)
         leg_color = BROWN
         leg_positions = [(18, 35), (28, 35), (35, 35), (42, 35)]
         for leg_x, leg_y in leg_positions:
-            pygame.draw.line(self.image, leg_color, (leg_x, leg_y), (leg_x, leg_y + 8), 3)
+            pygame.draw.line(image, leg_color, (leg_x, leg_y), (leg_x, leg_y + 8), 3)
+        
+        return image
+
+
+class Jaguar(pygame.sprite.Sprite):
+    """The player-controlled jaguar"""
+    
+    def __init__(self, x, y, atlas=None):
+        super().__init__()
+        self.width = 60
+        self.height = 50
+        self.x = x
+        self.y = y
+        self.prev_x = x
+        self.prev_y = y
+        self.speed = 6
+        self.dx = 0
+        self.dy = 0
+        self.pouncing = False
+        self.pounce_timer = 0
+        self.pounce_cooldown = 0
+        self.facing_right = True
+        self.animation_frame = 0
+        self.animation_speed = 0.2
+        
+        # Frames are shared through the atlas instead of redrawn per tick
+        if atlas is None:
+            atlas = JaguarAtlas(self.width, self.height)
+        self.atlas = atlas
+        
+        self.draw_jaguar()
+        self.rect = self.image.get_rect()
+        self.rect.x = self.x
+        self.rect.y = self.y
+    
+    def draw_jaguar(self):
+        """Select the jaguar sprite for the current pose"""
+        bucket = self.atlas.bucket_for(self.animation_frame)
+        self.image = self.atlas.get_frame(self.facing_right, self.pouncing, bucket)
+        self.mask = self.atlas.mask_for(self.image)
     
     def update(self, keys):
         """Update jaguar position and state"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
         # Movement
         self.dx = 0
         self.dy = 0
@@ -176,131 +350,491 @@ class Jaguar(pygame.sprite.Sprite):
             self.pounce_cooldown = 30
             return True
         return False
+    
+    def snapshot(self):
+        """Position, pounce and animation state as a tuple"""
+        return (self.x, self.y, self.prev_x, self.prev_y, self.dx, self.dy, self.facing_right,
+                self.pouncing, self.pounce_timer, self.pounce_cooldown, self.animation_frame)
+    
+    def restore(self, state):
+        """Apply a tuple from snapshot() and reselect the pose"""
+        (self.x, self.y, self.prev_x, self.prev_y, self.dx, self.dy, self.facing_right,
+         self.pouncing, self.pounce_timer, self.pounce_cooldown, self.animation_frame) = state
+        self.rect.x = self.x
+        self.rect.y = self.y
+        self.draw_jaguar()
+
+
+class TypeImageCache:
+    """Flyweight images shared by every sprite of the same type"""
+    
+    def __init__(self):
+        self.images = {}
+        # Masks don't depend on the display format, so they outlive invalidate()
+        self.masks = {}
+        self.display_mode = None
+    
+    def current_display_mode(self):
+        """Identify the display format that cached images were converted to"""
+        display = pygame.display.get_surface() if pygame.display.get_init() else None
+        if display is None:
+            return None
+        return (display.get_size(), display.get_bitsize(), display.get_masks())
+    
+    def invalidate(self):
+        """Drop every cached image (e.g. after the display is recreated)"""
+        self.images.clear()
+        self.display_mode = None
+    
+    def get(self, key, size, draw):
+        """Return the shared image for key, drawing it on first use"""
+        display_mode = self.current_display_mode()
+        if display_mode != self.display_mode:
+            self.images.clear()
+            self.display_mode = display_mode
+        
+        image = self.images.get(key)
+        if image is None:
+            image = pygame.Surface(size, pygame.SRCALPHA)
+            draw(image)
+            if display_mode is not None:
+                image = image.convert_alpha()
+            self.images[key] = image
+        return image
+    
+    def get_mask(self, key, size, draw):
+        """Return the shared collision mask for key, built from its image on first use"""
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = self.masks[key] = pygame.mask.from_surface(self.get(key, size, draw))
+        return mask
+
+
+type_images = TypeImageCache()
+
+
+class EntityPool:
+    """Free list of retired sprites, reused instead of reallocated on spawn"""
+    
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []
+        self.allocated = 0
+        self.reused = 0
+    
+    def acquire(self, *args):
+        """Reset and return a free entity, allocating only when the pool is empty"""
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args)
+            self.reused += 1
+        else:
+            entity = self.factory(*args)
+            entity.pool = self
+            self.allocated += 1
+        return entity
+    
+    def restore(self, state, *args):
+        """Return an entity rebuilt from a snapshot tuple, skipping the random reset when reused"""
+        if self.free:
+            entity = self.free.pop()
+            self.reused += 1
+        else:
+            entity = self.factory(*args)
+            entity.pool = self
+            self.allocated += 1
+        entity.restore(state)
+        return entity
+    
+    def release(self, entity):
+        """Return a retired entity to the free list"""
+        self.free.append(entity)
+    
+    def prewarm(self, count, *args):
+        """Allocate entities up front so early spawns never allocate"""
+        for _ in range(count):
+            entity = self.factory(*args)
+            entity.pool = self
+            self.allocated += 1
+            self.free.append(entity)
+    
+    def stats(self):
+        """Pool occupancy and allocation counters"""
+        return {
+            'allocated': self.allocated,
+            'reused': self.reused,
+            'free': len(self.free),
+            'in_use': self.allocated - len(self.free),
+        }
 
 
 class Prey(pygame.sprite.Sprite):
     """Prey animals for the jaguar to hunt"""
     
-    def __init__(self):
+    pool = None
+    
+    # Culled once this far past the left edge
+    CULL_X = -50
+    
+    # Per-type constants live on the class, shared by every instance
+    types = ('rabbit', 'deer', 'monkey')
+    width = 35
+    height = 35
+    points = 10
+    
+    def __init__(self, rng=random):
         super().__init__()
-        self.types = ['rabbit', 'deer', 'monkey']
-        self.type = random.choice(self.types)
-        self.width = 35
-        self.height = 35
+        self.rect = pygame.Rect(0, 0, self.width, self.height)
+        self.reset(rng)
+    
+    @property
+    def type_id(self):
+        return ENTITY_TYPE_IDS[self.type]
+    
+    @staticmethod
+    def roll(rng=random):
+        """Type, row and speed for a fresh spawn, drawn in that order"""
+        return rng.choice(Prey.types), rng.randint(100, SCREEN_HEIGHT - 100), rng.uniform(2.5, 4.5)
+    
+    @staticmethod
+    def type_art(prey_type):
+        """(key, size, draw) of the shared image and mask for a prey type"""
+        return ('prey', prey_type), (Prey.width, Prey.height), lambda image: Prey.draw_prey(image, prey_type)
+    
+    def reset(self, rng=random):
+        """(Re)initialize type, position and speed for a fresh spawn"""
+        self.type, self.y, self.speed = self.roll(rng)
         self.x = SCREEN_WIDTH
-        self.y = random.randint(100, SCREEN_HEIGHT - 100)
-        self.speed = random.uniform(2.5, 4.5)
-        self.points = 10
-        
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        self.rect = self.image.get_rect()
+        self.prev_x = self.x
+        self.load_image()
+    
+    def load_image(self):
+        """Pick up the shared image and mask for this prey type and place the rect"""
+        art = self.type_art(self.type)
+        self.image = type_images.get(*art)
+        self.mask = type_images.get_mask(*art)
         self.rect.x = self.x
         self.rect.y = self.y
-        
-        self.draw_prey()
     
-    def draw_prey(self):
+    def snapshot(self):
+        """Type, position and speed as a tuple"""
+        return (self.type, self.x, self.prev_x, self.y, self.speed)
+    
+    def restore(self, state):
+        """Apply a tuple from snapshot()"""
+        self.type, self.x, self.prev_x, self.y, self.speed = state
+        self.load_image()
+    
+    def kill(self):
+        """Remove from all groups, returning to the pool if pooled"""
+        if self.alive():
+            super().kill()
+            if self.pool is not None:
+                self.pool.release(self)
+    
+    @staticmethod
+    def draw_prey(image, prey_type):
         """Draw prey based on type"""
-        self.image.fill((0, 0, 0, 0))
+        image.fill((0, 0, 0, 0))
         
-        if self.type == 'rabbit':
+        if prey_type == 'rabbit':
             # Body
-            pygame.draw.ellipse(self.image, (200, 200, 200), (8, 15, 20, 15))
+            pygame.draw.ellipse(image, (200, 200, 200), (8, 15, 20, 15))
             # Head
-            pygame.draw.circle(self.image, (220, 220, 220), (25, 18), 8)
+            pygame.draw.circle(image, (220, 220, 220), (25, 18), 8)
             # Ears
-            pygame.draw.ellipse(self.image, (200, 200, 200), (26, 5, 4, 12))
-            pygame.draw.ellipse(self.image, (200, 200, 200), (30, 5, 4, 12))
+            pygame.draw.ellipse(image, (200, 200, 200), (26, 5, 4, 12))
+            pygame.draw.ellipse(image, (200, 200, 200), (30, 5, 4, 12))
             # Eye
-            pygame.draw.circle(self.image, BLACK, (28, 18), 2)
+            pygame.draw.circle(image, BLACK, (28, 18), 2)
             
-        elif self.type == 'deer':
+        elif prey_type == 'deer':
             # Body
-            pygame.draw.ellipse(self.image, (160, 82, 45), (5, 15, 25, 18))
+            pygame.draw.ellipse(image, (160, 82, 45), (5, 15, 25, 18))
             # Head
-            pygame.draw.circle(self.image, (160, 82, 45), (28, 18), 7)
+            pygame.draw.circle(image, (160, 82, 45), (28, 18), 7)
             # Antlers
-            pygame.draw.line(self.image, BROWN, (28, 12), (28, 5), 2)
-            pygame.draw.line(self.image, BROWN, (28, 8), (24, 4), 2)
-            pygame.draw.line(self.image, BROWN, (28, 8), (32, 4), 2)
+            pygame.draw.line(image, BROWN, (28, 12), (28, 5), 2)
+            pygame.draw.line(image, BROWN, (28, 8), (24, 4), 2)
+            pygame.draw.line(image, BROWN, (28, 8), (32, 4), 2)
             
-        elif self.type == 'monkey':
+        elif prey_type == 'monkey':
             # Body
-            pygame.draw.ellipse(self.image, (139, 90, 43), (10, 12, 18, 20))
+            pygame.draw.ellipse(image, (139, 90, 43), (10, 12, 18, 20))
             # Head
-            pygame.draw.circle(self.image, (139, 90, 43), (19, 12), 9)
+            pygame.draw.circle(image, (139, 90, 43), (19, 12), 9)
             # Face
-            pygame.draw.circle(self.image, (205, 133, 63), (19, 14), 5)
+            pygame.draw.circle(image, (205, 133, 63), (19, 14), 5)
             # Eyes
-            pygame.draw.circle(self.image, BLACK, (17, 12), 2)
-            pygame.draw.circle(self.image, BLACK, (21, 12), 2)
+            pygame.draw.circle(image, BLACK, (17, 12), 2)
+            pygame.draw.circle(image, BLACK, (21, 12), 2)
             # Tail
-            pygame.draw.arc(self.image, (139, 90, 43), (22, 18, 15, 20), 0, 3.14, 3)
+            pygame.draw.arc(image, (139, 90, 43), (22, 18, 15, 20), 0, 3.14, 3)
     
     def update(self):
         """Move prey across screen"""
+        self.prev_x = self.x
         self.x -= self.speed
         self.rect.x = self.x
         
-        if self.x < -50:
+        if self.x < self.CULL_X:
             self.kill()
 
 
 class Obstacle(pygame.sprite.Sprite):
     """Obstacles that damage the jaguar"""
     
-    def __init__(self):
+    pool = None
+    
+    # Culled once this far past the left edge
+    CULL_X = -60
+    
+    width = 50
+    height = 80
+    speed = 3
+    
+    def __init__(self, rng=random):
         super().__init__()
-        self.width = 50
-        self.height = 80
+        self.rect = pygame.Rect(0, 0, self.width, self.height)
+        self.reset(rng)
+    
+    @property
+    def type_id(self):
+        return TREE_TYPE
+    
+    @staticmethod
+    def roll(rng=random):
+        """Row for a fresh spawn"""
+        return rng.randint(80, SCREEN_HEIGHT - 150)
+    
+    @staticmethod
+    def type_art():
+        """(key, size, draw) of the shared tree image and mask"""
+        return ('obstacle', 'tree'), (Obstacle.width, Obstacle.height), Obstacle.draw_obstacle
+    
+    def reset(self, rng=random):
+        """(Re)initialize position for a fresh spawn"""
         self.x = SCREEN_WIDTH
-        self.y = random.randint(80, SCREEN_HEIGHT - 150)
-        self.speed = 3
-        
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        self.rect = self.image.get_rect()
+        self.prev_x = self.x
+        self.y = self.roll(rng)
+        self.load_image()
+    
+    def load_image(self):
+        """Pick up the shared tree image and mask and place the rect"""
+        art = self.type_art()
+        self.image = type_images.get(*art)
+        self.mask = type_images.get_mask(*art)
         self.rect.x = self.x
         self.rect.y = self.y
-        
-        self.draw_obstacle()
     
-    def draw_obstacle(self):
+    def snapshot(self):
+        """Position as a tuple"""
+        return (self.x, self.prev_x, self.y)
+    
+    def restore(self, state):
+        """Apply a tuple from snapshot()"""
+        self.x, self.prev_x, self.y = state
+        self.load_image()
+    
+    def kill(self):
+        """Remove from all groups, returning to the pool if pooled"""
+        if self.alive():
+            super().kill()
+            if self.pool is not None:
+                self.pool.release(self)
+    
+    @staticmethod
+    def draw_obstacle(image):
         """Draw tree obstacle"""
-        self.image.fill((0, 0, 0, 0))
+        image.fill((0, 0, 0, 0))
         
         # Trunk
-        pygame.draw.rect(self.image, BROWN, (15, 20, 20, 60))
+        pygame.draw.rect(image, BROWN, (15, 20, 20, 60))
         
         # Foliage
-        pygame.draw.circle(self.image, DARK_GREEN, (25, 20), 25)
-        pygame.draw.circle(self.image, GRASS_GREEN, (15, 15), 18)
-        pygame.draw.circle(self.image, GRASS_GREEN, (35, 15), 18)
+        pygame.draw.circle(image, DARK_GREEN, (25, 20), 25)
+        pygame.draw.circle(image, GRASS_GREEN, (15, 15), 18)
+        pygame.draw.circle(image, GRASS_GREEN, (35, 15), 18)
     
     def update(self):
         """Move obstacle across screen"""
+        self.prev_x = self.x
+        self.x -= self.speed
+        self.rect.x = self.x
+        
+        if self.x < self.CULL_X:
+            self.kill()
+
+
+# Shared per-type constants indexed by type id (the spectator wire format's
+# entity kinds): the prey types, then the tree
+ENTITY_TYPES = tuple(
+    {'name': name, 'points': Prey.points, 'width': Prey.width, 'height': Prey.height, 'cull_x': Prey.CULL_X}
+    for name in Prey.types
+) + ({'name': 'tree', 'points': 0, 'width': Obstacle.width, 'height': Obstacle.height, 'cull_x': Obstacle.CULL_X},)
+ENTITY_TYPE_IDS = {kind['name']: type_id for type_id, kind in enumerate(ENTITY_TYPES)}
+TREE_TYPE = ENTITY_TYPE_IDS['tree']
+
+
+class EntityRecord:
+    """Sprite-free prey or tree, simulated by headless games
+    
+    A type id into ENTITY_TYPES plus motion and a rect; names, points and
+    masks come from the shared type tables. Groups take records in place
+    of sprites, but a record belongs to at most one group at a time.
+    """
+    
+    __slots__ = ('type_id', 'x', 'prev_x', 'y', 'speed', 'rect', 'group', 'pool')
+    
+    def __init__(self, rng=random):
+        self.group = None
+        self.pool = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(rng)
+    
+    @property
+    def type(self):
+        return ENTITY_TYPES[self.type_id]['name']
+    
+    @property
+    def points(self):
+        return ENTITY_TYPES[self.type_id]['points']
+    
+    def place(self):
+        """Size the rect for the record's type and move it to its position"""
+        kind = ENTITY_TYPES[self.type_id]
+        rect = self.rect
+        rect.size = (kind['width'], kind['height'])
+        rect.x = self.x
+        rect.y = self.y
+    
+    def add_internal(self, group):
+        self.group = group
+    
+    def remove_internal(self, group):
+        self.group = None
+    
+    def alive(self):
+        return self.group is not None
+    
+    def kill(self):
+        """Leave the group, returning to the pool if pooled"""
+        group = self.group
+        if group is not None:
+            group.remove_internal(self)
+            self.group = None
+            if self.pool is not None:
+                self.pool.release(self)
+    
+    def update(self):
+        """Move across the screen, as Prey and Obstacle do"""
+        self.prev_x = self.x
         self.x -= self.speed
         self.rect.x = self.x
         
-        if self.x < -60:
+        if self.x < ENTITY_TYPES[self.type_id]['cull_x']:
             self.kill()
 
 
+class PreyRecord(EntityRecord):
+    """Prey as a record, drawing from the RNG exactly as Prey does"""
+    
+    __slots__ = ()
+    
+    @property
+    def mask(self):
+        return type_images.get_mask(*Prey.type_art(self.type))
+    
+    def reset(self, rng=random):
+        """(Re)initialize type, position and speed for a fresh spawn"""
+        prey_type, self.y, self.speed = Prey.roll(rng)
+        self.type_id = ENTITY_TYPE_IDS[prey_type]
+        self.x = self.prev_x = SCREEN_WIDTH
+        self.place()
+    
+    def snapshot(self):
+        """Same tuple as Prey.snapshot()"""
+        return (self.type, self.x, self.prev_x, self.y, self.speed)
+    
+    def restore(self, state):
+        """Apply a tuple from snapshot()"""
+        prey_type, self.x, self.prev_x, self.y, self.speed = state
+        self.type_id = ENTITY_TYPE_IDS[prey_type]
+        self.place()
+
+
+class TreeRecord(EntityRecord):
+    """A tree as a record, drawing from the RNG exactly as Obstacle does"""
+    
+    __slots__ = ()
+    
+    @property
+    def mask(self):
+        return type_images.get_mask(*Obstacle.type_art())
+    
+    def reset(self, rng=random):
+        """(Re)initialize position for a fresh spawn"""
+        self.type_id = TREE_TYPE
+        self.speed = Obstacle.speed
+        self.y = Obstacle.roll(rng)
+        self.x = self.prev_x = SCREEN_WIDTH
+        self.place()
+    
+    def snapshot(self):
+        """Same tuple as Obstacle.snapshot()"""
+        return (self.x, self.prev_x, self.y)
+    
+    def restore(self, state):
+        """Apply a tuple from snapshot()"""
+        self.x, self.prev_x, self.y = state
+        self.place()
+
+
 class Particle(pygame.sprite.Sprite):
     """Visual effect particles"""
     
-    def __init__(self, x, y, color):
+    pool = None
+    
+    def __init__(self, x, y, color, rng=random):
         super().__init__()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, color, rng)
+    
+    def reset(self, x, y, color, rng=random):
+        """(Re)initialize a particle for a new burst"""
         self.x = x
         self.y = y
-        self.size = random.randint(3, 8)
+        self.size = rng.randint(3, 8)
         self.color = color
-        self.lifetime = random.randint(20, 40)
-        self.vx = random.uniform(-2, 2)
-        self.vy = random.uniform(-3, -1)
-        
-        self.image = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        self.rect = self.image.get_rect()
-        pygame.draw.circle(self.image, self.color, (self.size, self.size), self.size)
+        self.lifetime = rng.randint(20, 40)
+        self.vx = rng.uniform(-2, 2)
+        self.vy = rng.uniform(-3, -1)
+        self.load_image()
+    
+    def load_image(self):
+        """Pick up the shared circle for this color and size and place the rect"""
+        size = self.size
+        color = self.color
+        self.image = type_images.get(('particle', color, size), (size * 2, size * 2),
+                                     lambda image: pygame.draw.circle(image, color, (size, size), size))
+        self.rect.size = self.image.get_size()
+        self.rect.topleft = (self.x, self.y)
+    
+    def snapshot(self):
+        """Motion, look and remaining lifetime as a tuple"""
+        return (self.x, self.y, self.vx, self.vy, self.size, self.color, self.lifetime)
+    
+    def restore(self, state):
+        """Apply a tuple from snapshot()"""
+        self.x, self.y, self.vx, self.vy, self.size, self.color, self.lifetime = state
+        self.load_image()
+    
+    def kill(self):
+        """Remove from all groups, returning to the pool if pooled"""
+        if self.alive():
+            super().kill()
+            if self.pool is not None:
+                self.pool.release(self)
     
     def update(self):
         """Update particle position"""
@@ -314,152 +848,1636 @@ class Particle(pygame.sprite.Sprite):
             self.kill()
 
 
-class Game:
-    """Main game class"""
+class ParticleSystem:
+    """Struct-of-arrays particle engine backed by NumPy"""
     
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Jaguar Hunt Game")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 32)
-        
-        self.state = MENU
-        self.score = 0
-        self.lives = 3
-        self.high_score = 0
-        
-        # Sprite groups
-        self.all_sprites = pygame.sprite.Group()
-        self.prey_group = pygame.sprite.Group()
-        self.obstacle_group = pygame.sprite.Group()
-        self.particle_group = pygame.sprite.Group()
-        
-        self.jaguar = None
-        self.spawn_timer = 0
-        self.difficulty_timer = 0
-        self.spawn_rate = 60
-        
-    def reset_game(self):
-        """Reset game state"""
-        self.all_sprites.empty()
-        self.prey_group.empty()
-        self.obstacle_group.empty()
-        self.particle_group.empty()
-        
-        self.score = 0
-        self.lives = 3
-        self.spawn_timer = 0
-        self.difficulty_timer = 0
-        self.spawn_rate = 60
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.dropped = 0
+        self.rng = np.random.default_rng(seed)
         
-        self.jaguar = Jaguar(100, SCREEN_HEIGHT // 2)
-        self.all_sprites.add(self.jaguar)
+        # Live particles are packed into slots [0, count)
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int32)
         
-        self.state = PLAYING
+        # Pre-drawn circle stamps indexed by color_index * 9 + size
+        self.palette = {}
+        self.stamps = np.empty(0, dtype=object)
+        self.scaled_stamps = None
     
-    def draw_background(self):
-        """Draw game background"""
-        # Sky
-        self.screen.fill(SKY_BLUE)
-        
-        # Grass
-        pygame.draw.rect(self.screen, GRASS_GREEN, 
-                        (0, SCREEN_HEIGHT - 80, SCREEN_WIDTH, 80))
-        
-        # Grass details
-        for i in range(0, SCREEN_WIDTH, 20):
-            pygame.draw.line(self.screen, DARK_GREEN, 
-                           (i, SCREEN_HEIGHT - 80), 
-                           (i, SCREEN_HEIGHT - 70), 2)
+    def __len__(self):
+        return self.count
     
-    def draw_ui(self):
-        """Draw UI elements"""
-        # Score
-        score_text = self.small_font.render(f"Score: {self.score}", True, WHITE)
-        score_shadow = self.small_font.render(f"Score: {self.score}", True, BLACK)
-        self.screen.blit(score_shadow, (22, 12))
-        self.screen.blit(score_text, (20, 10))
-        
-        # Lives
-        lives_text = self.small_font.render(f"Lives: {self.lives}", True, WHITE)
-        lives_shadow = self.small_font.render(f"Lives: {self.lives}", True, BLACK)
-        self.screen.blit(lives_shadow, (22, 47))
-        self.screen.blit(lives_text, (20, 45))
-        
-        # High Score
-        high_text = self.small_font.render(f"High: {self.high_score}", True, GOLD)
-        self.screen.blit(high_text, (SCREEN_WIDTH - 180, 10))
-        
-        # Pounce cooldown indicator
-        if self.jaguar and self.jaguar.pounce_cooldown > 0:
-            cooldown_width = 100
-            cooldown_height = 10
-            cooldown_x = SCREEN_WIDTH // 2 - cooldown_width // 2
-            cooldown_y = SCREEN_HEIGHT - 30
+    def color_index(self, color):
+        """Register a color and draw its circle stamps"""
+        index = self.palette.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette[color] = index
             
-            pygame.draw.rect(self.screen, BLACK, 
-                           (cooldown_x - 2, cooldown_y - 2, cooldown_width + 4, cooldown_height + 4))
+            # Circles are opaque, so a colorkey blits faster than per-pixel alpha
+            key = (255, 0, 255) if tuple(color[:3]) != (255, 0, 255) else (0, 255, 0)
+            stamps = []
+            for size in range(9):
+                stamp = pygame.Surface((max(1, size * 2), max(1, size * 2)))
+                stamp.fill(key)
+                if size:
+                    pygame.draw.circle(stamp, color, (size, size), size)
+                stamp.set_colorkey(key, pygame.RLEACCEL)
+                if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                    stamp = stamp.convert()
+                stamps.append(stamp)
             
-            fill_width = cooldown_width * (1 - self.jaguar.pounce_cooldown / 30)
-            pygame.draw.rect(self.screen, ORANGE, 
-                           (cooldown_x, cooldown_y, fill_width, cooldown_height))
-        else:
-            ready_text = self.small_font.render("POUNCE READY!", True, GOLD)
-            text_rect = ready_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 25))
-            self.screen.blit(ready_text, text_rect)
+            table = np.empty(len(self.stamps) + len(stamps), dtype=object)
+            table[:len(self.stamps)] = self.stamps
+            table[len(self.stamps):] = stamps
+            self.stamps = table
+        return index
     
-    def draw_menu(self):
-        """Draw main menu"""
-        self.draw_background()
-        
-        title = self.font.render("JAGUAR HUNT", True, GOLD)
-        title_shadow = self.font.render("JAGUAR HUNT", True, BLACK)
-        title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 150))
+    def emit(self, x, y, color, count):
+        """Spawn a burst of particles at (x, y)"""
+        free = self.capacity - self.count
+        if count > free:
+            self.dropped += count - free
+            count = free
+        if count <= 0:
+            return
         
-        self.screen.blit(title_shadow, (title_rect.x + 3, title_rect.y + 3))
-        self.screen.blit(title, title_rect)
+        start = self.count
+        end = start + count
+        self.pos[start:end, 0] = x
+        self.pos[start:end, 1] = y
+        self.vel[start:end, 0] = self.rng.uniform(-2, 2, count)
+        self.vel[start:end, 1] = self.rng.uniform(-3, -1, count)
+        self.lifetime[start:end] = self.rng.integers(20, 41, count)
+        self.size[start:end] = self.rng.integers(3, 9, count)
+        self.color[start:end] = self.color_index(color)
+        self.count = end
+    
+    def update(self):
+        """Advance every live particle in one vectorized step"""
+        n = self.count
+        if n == 0:
+            return
         
-        instructions = [
-            "Press SPACE to Start",
-            "",
-            "Controls:",
-            "Arrow Keys / WASD - Move",
-            "SPACE - Pounce",
-            "ESC - Pause",
-            "",
-            "Hunt prey, avoid obstacles!"
-        ]
+        self.pos[:n] += self.vel[:n]
+        self.lifetime[:n] -= 1
         
-        y_offset = 280
-        for line in instructions:
-            text = self.small_font.render(line, True, WHITE)
-            text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
-            self.screen.blit(text, text_rect)
-            y_offset += 40
+        # Compact survivors to the front of the arrays
+        alive = self.lifetime[:n] > 0
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            live = len(keep)
+            for array in (self.pos, self.vel, self.lifetime, self.size, self.color):
+                array[:live] = array[keep]
+            self.count = live
     
-    def draw_game_over(self):
-        """Draw game over screen"""
-        self.draw_background()
-        
-        game_over_text = self.font.render("GAME OVER", True, RED)
-        game_over_shadow = self.font.render("GAME OVER", True, BLACK)
-        text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, 200))
+    def draw(self, surface, alpha=1.0, canvas=None):
+        """Blit every live particle from the stamp cache, alpha ticks past the last step"""
+        n = self.count
+        return self.draw_arrays(surface, self.pos[:n], self.vel[:n], self.size[:n], self.color[:n],
+                                alpha, canvas)
+    
+    def render_state(self):
+        """Copies of the arrays draw_arrays() needs, safe to hand to another thread"""
+        n = self.count
+        return tuple(array[:n].copy() for array in (self.pos, self.vel, self.size, self.color))
+    
+    def draw_arrays(self, surface, pos, vel, sizes, colors, alpha=1.0, canvas=None):
+        """Blit particles given as arrays (live slices or render_state() copies)
         
-        self.screen.blit(game_over_shadow, (text_rect.x + 3, text_rect.y + 3))
-        self.screen.blit(game_over_text, text_rect)
+        With a ScaledCanvas, positions and stamps are scaled down to its resolution.
+        """
+        n = len(pos)
+        if n == 0:
+            return None
         
-        score_text = self.small_font.render(f"Final Score: {self.score}", True, WHITE)
-        score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, 300))
-        self.screen.blit(score_text, score_rect)
+        scale = 1.0 if canvas is None else canvas.scale
+        stamps = self.stamp_table(canvas)[colors * 9 + sizes].tolist()
+        if alpha < 1.0:
+            positions = pos - vel * (1.0 - alpha)
+        else:
+            positions = pos
+        if scale != 1.0:
+            positions = positions * scale
+        positions = positions.astype(np.int32)
+        surface.blits(zip(stamps, positions.tolist()), False)
         
-        high_text = self.small_font.render(f"High Score: {self.high_score}", True, GOLD)
-        high_rect = high_text.get_rect(center=(SCREEN_WIDTH // 2, 350))
-        self.screen.blit(high_text, high_rect)
+        # Bounding box of the whole cloud, for dirty-rect rendering
+        left, top = positions.min(axis=0)
+        right, bottom = (positions + (sizes * 2 * scale)[:, None]).max(axis=0)
+        bounds = pygame.Rect(int(left), int(top), int(right - left), int(bottom - top))
+        return bounds.clip(surface.get_rect())
+    
+    def stamp_table(self, canvas=None):
+        """Stamps indexed by color_index * 9 + size, resized for a ScaledCanvas if given"""
+        if canvas is None:
+            return self.stamps
+        cached = self.scaled_stamps
+        if cached is None or cached[0] is not canvas or len(cached[1]) != len(self.stamps):
+            table = np.empty(len(self.stamps), dtype=object)
+            for index, stamp in enumerate(self.stamps):
+                table[index] = canvas.image(stamp)
+            cached = self.scaled_stamps = (canvas, table)
+        return cached[1]
+    
+    def snapshot(self):
+        """Copies of the live slots plus the emitter RNG state"""
+        n = self.count
+        arrays = tuple(array[:n].copy() for array in (self.pos, self.vel, self.lifetime, self.size, self.color))
+        return arrays, self.rng.bit_generator.state, self.dropped
+    
+    def restore(self, state):
+        """Apply a tuple from snapshot()"""
+        arrays, rng_state, self.dropped = state
+        n = len(arrays[0])
+        for array, saved in zip((self.pos, self.vel, self.lifetime, self.size, self.color), arrays):
+            array[:n] = saved
+        self.count = n
+        self.rng.bit_generator.state = rng_state
+    
+    def clear(self):
+        """Remove every particle"""
+        self.count = 0
+    
+    def reseed(self, seed):
+        """Restart the random stream bursts are drawn from"""
+        self.rng = np.random.default_rng(seed)
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces"""
+    
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def lookup(self, key):
+        """Return a cached surface and mark it most recently used"""
+        surface = self.entries.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return surface
+    
+    def store(self, key, surface):
+        """Insert a surface, evicting the least recently used entry"""
+        self.entries[key] = surface
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return surface
+    
+    def render(self, font, text, color, antialias=True):
+        """Cached equivalent of font.render(text, antialias, color)"""
+        key = (font, text, color, antialias)
+        surface = self.lookup(key)
+        if surface is None:
+            surface = self.store(key, font.render(text, antialias, color))
+        return surface
+    
+    def render_shadowed(self, font, text, color, shadow_color=BLACK, offset=2, antialias=True):
+        """Text with its drop shadow baked into a single surface"""
+        key = (font, text, color, antialias, shadow_color, offset)
+        surface = self.lookup(key)
+        if surface is None:
+            text_surface = font.render(text, antialias, color)
+            shadow_surface = font.render(text, antialias, shadow_color)
+            width, height = text_surface.get_size()
+            surface = pygame.Surface((width + offset, height + offset), pygame.SRCALPHA)
+            surface.blit(shadow_surface, (offset, offset))
+            surface.blit(text_surface, (0, 0))
+            surface = self.store(key, surface)
+        return surface
+    
+    def stats(self):
+        """Text cache hit/miss counters"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries)}
+
+
+class ScaledCanvas:
+    """Draws in logical coordinates onto a surface smaller than the window
+    
+    Blit positions are multiplied by the scale and images are swapped for
+    resized copies, cached per source surface for as long as it is alive.
+    """
+    
+    def __init__(self, like, scale):
+        width, height = like.get_size()
+        self.scale = scale
+        self.surface = pygame.Surface((round(width * scale), round(height * scale)), 0, like)
+        self.images = weakref.WeakKeyDictionary()
+    
+    def image(self, image):
+        """Resized copy of a logical-resolution image"""
+        scaled = self.images.get(image)
+        if scaled is None:
+            width, height = image.get_size()
+            size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+            key = image.get_colorkey()
+            if not width or not height:
+                # Nothing to draw (e.g. an empty line of text); scaling it would crash
+                scaled = image
+            elif key is not None or image.get_bitsize() < 24:
+                # Smoothing would blend the colorkey into the edges
+                scaled = pygame.transform.scale(image, size)
+                if key is not None:
+                    scaled.set_colorkey(key, pygame.RLEACCEL)
+            else:
+                scaled = pygame.transform.smoothscale(image, size)
+            self.images[image] = scaled
+        return scaled
+    
+    def blit(self, image, dest):
+        """Surface.blit with a logical image and position"""
+        scale = self.scale
+        return self.surface.blit(self.image(image), (dest[0] * scale, dest[1] * scale))
+    
+    def blits(self, sequence, doreturn=True):
+        """Surface.blits with logical images and positions"""
+        scale = self.scale
+        image = self.image
+        return self.surface.blits([(image(source), (dest[0] * scale, dest[1] * scale))
+                                   for source, dest in sequence], doreturn)
+    
+    def fill(self, color, rect):
+        """Surface.fill with a logical rect"""
+        x, y, width, height = pygame.Rect(rect)
+        scale = self.scale
+        return self.surface.fill(color, (x * scale, y * scale, width * scale, height * scale))
+
+
+class SpatialHash:
+    """Uniform-grid spatial hash for broadphase rect queries"""
+    
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        # Cells hold insertion-ordered dicts so query order is deterministic
+        self.cells = {}
+        self.spans = {}
+    
+    def __len__(self):
+        return len(self.spans)
+    
+    def span_of(self, rect):
+        """Range of cells covered by a rect"""
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+    
+    def add_span(self, sprite, span):
+        x0, y0, x1, y1 = span
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    cell = cells[(cx, cy)] = {}
+                cell[sprite] = None
+    
+    def remove_span(self, sprite, span):
+        x0, y0, x1, y1 = span
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells[(cx, cy)]
+                del cell[sprite]
+                if not cell:
+                    del cells[(cx, cy)]
+    
+    def insert(self, sprite):
+        """Start tracking a sprite"""
+        span = self.span_of(sprite.rect)
+        self.spans[sprite] = span
+        self.add_span(sprite, span)
+    
+    def remove(self, sprite):
+        """Stop tracking a sprite"""
+        span = self.spans.pop(sprite, None)
+        if span is not None:
+            self.remove_span(sprite, span)
+    
+    def move(self, sprite):
+        """Re-bucket a sprite whose rect moved; cheap when it stays in its cells"""
+        span = self.span_of(sprite.rect)
+        old_span = self.spans[sprite]
+        if span != old_span:
+            self.remove_span(sprite, old_span)
+            self.add_span(sprite, span)
+            self.spans[sprite] = span
+    
+    def query(self, rect):
+        """Sprites whose cells overlap rect (a superset of actual overlaps)"""
+        x0, y0, x1, y1 = self.span_of(rect)
+        cells = self.cells
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return found
+    
+    def clear(self):
+        """Forget every sprite"""
+        self.cells.clear()
+        self.spans.clear()
+
+
+class HashedGroup(pygame.sprite.RenderUpdates):
+    """Sprite group that keeps a spatial hash in sync with its members when it pays
+    
+    The hash is kept only while the group is large and queried often
+    (hash_min members, hash_queries collide() calls between updates);
+    otherwise there is nothing to re-bucket and collide() tests every member.
+    """
+    
+    def __init__(self, *sprites, cell_size=SPATIAL_CELL_SIZE, hash_min=SPATIAL_HASH_MIN,
+                 hash_queries=SPATIAL_HASH_QUERIES):
+        self.spatial_hash = SpatialHash(cell_size)
+        self.hash_min = hash_min
+        self.hash_queries = hash_queries
+        self.queries = 0
+        self.hashed = False
+        super().__init__(*sprites)
+    
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if self.hashed:
+            self.spatial_hash.insert(sprite)
+    
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if self.hashed:
+            self.spatial_hash.remove(sprite)
+    
+    def build_hash(self):
+        """Start keeping the spatial hash, bucketing every member"""
+        self.hashed = True
+        for sprite in self.spritedict:
+            self.spatial_hash.insert(sprite)
+    
+    def drop_hash(self):
+        """Stop keeping the spatial hash"""
+        self.hashed = False
+        self.spatial_hash.clear()
+    
+    def wants_hash(self):
+        """Whether the hash pays for the current size and query rate, counting the queries since the last update"""
+        queries, self.queries = self.queries, 0
+        members = len(self.spritedict)
+        if self.hashed:
+            return members >= self.hash_min // 2 and queries >= self.hash_queries // 2
+        return members >= self.hash_min and queries >= self.hash_queries
+    
+    def update(self, *args, **kwargs):
+        """Update members, re-bucketing the ones that changed cells"""
+        if self.wants_hash() != self.hashed:
+            if self.hashed:
+                self.drop_hash()
+            else:
+                self.build_hash()
+        if not self.hashed:
+            super().update(*args, **kwargs)
+            return
+        spatial_hash = self.spatial_hash
+        spans = spatial_hash.spans
+        size = spatial_hash.cell_size
+        for sprite in self.sprites():
+            sprite.update(*args, **kwargs)
+            span = spans.get(sprite)
+            if span is None:
+                continue
+            # Inline span_of(): most sprites stay in their cells from tick to tick
+            left, top, width, height = sprite.rect
+            if (left // size != span[0] or top // size != span[1] or
+                    (left + width - 1) // size != span[2] or (top + height - 1) // size != span[3]):
+                spatial_hash.move(sprite)
+    
+    def collide(self, sprite, dokill):
+        """spritecollide() through the spatial hash broadphase, or linearly without one"""
+        self.queries += 1
+        rect = sprite.rect
+        if self.hashed:
+            hits = [other for other in self.spatial_hash.query(rect) if rect.colliderect(other.rect)]
+        else:
+            hits = [other for other in self.sprites() if rect.colliderect(other.rect)]
+        if dokill:
+            for other in hits:
+                other.kill()
+        return hits
+
+
+class ScrollingStore:
+    """Struct-of-arrays type ids and positions for entities that scroll right to left
+    
+    Slots [0, count) stay in insertion order, matching the owning group's
+    iteration order, so sprites still draw in the order they spawned.
+    """
+    
+    FIELDS = ('type_id', 'x', 'prev_x', 'y', 'speed', 'cull_x', 'width', 'height')
+    
+    def __init__(self, capacity=SCROLLING_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.sprites = []
+        self.members = set()
+        # Index into ENTITY_TYPES
+        self.type_id = np.zeros(capacity, dtype=np.uint8)
+        self.x = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.cull_x = np.zeros(capacity)
+        # Rect rows and sizes never change while scrolling
+        self.y = np.zeros(capacity, dtype=np.int64)
+        self.width = np.zeros(capacity, dtype=np.int64)
+        self.height = np.zeros(capacity, dtype=np.int64)
+    
+    def __len__(self):
+        return self.count
+    
+    def grow(self):
+        """Double the capacity of every array"""
+        self.capacity *= 2
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            array = np.zeros(self.capacity, dtype=old.dtype)
+            array[:self.count] = old[:self.count]
+            setattr(self, name, array)
+    
+    def add(self, sprite):
+        """Append a sprite or record, copying its type, position and speed into the arrays"""
+        if sprite in self.members:
+            return
+        if self.count == self.capacity:
+            self.grow()
+        i = self.count
+        rect = sprite.rect
+        type_id = sprite.type_id
+        self.type_id[i] = type_id
+        self.x[i] = sprite.x
+        self.prev_x[i] = sprite.prev_x
+        self.speed[i] = sprite.speed
+        self.cull_x[i] = ENTITY_TYPES[type_id]['cull_x']
+        self.y[i] = rect.y
+        self.width[i] = rect.width
+        self.height[i] = rect.height
+        self.sprites.append(sprite)
+        self.members.add(sprite)
+        self.count += 1
+    
+    def remove(self, sprite):
+        """Drop a sprite, shifting later slots down to keep the order"""
+        if sprite not in self.members:
+            return
+        self.members.discard(sprite)
+        i = self.sprites.index(sprite)
+        del self.sprites[i]
+        n = self.count
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[i:n - 1] = array[i + 1:n]
+        self.count = n - 1
+    
+    def advance(self):
+        """Move every entity one tick and drop the ones past their cull line
+        
+        Returns the culled sprites, already removed from the store.
+        """
+        n = self.count
+        if n == 0:
+            return []
+        x = self.x[:n]
+        self.prev_x[:n] = x
+        x -= self.speed[:n]
+        
+        alive = x >= self.cull_x[:n]
+        if alive.all():
+            return []
+        culled = [sprite for sprite, keep in zip(self.sprites, alive.tolist()) if not keep]
+        keep = np.flatnonzero(alive)
+        live = len(keep)
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[:live] = array[keep]
+        self.sprites = [self.sprites[i] for i in keep.tolist()]
+        self.members.difference_update(culled)
+        self.count = live
+        return culled
+    
+    def lefts(self):
+        """Rect left edges, rounded half away from zero exactly like Rect does"""
+        x = self.x[:self.count]
+        whole = np.trunc(x)
+        return (whole + np.sign(x) * (np.abs(x - whole) >= 0.5)).astype(np.int64)
+    
+    def sync(self, indices=None):
+        """Copy array positions back onto sprites and their rects"""
+        n = self.count
+        if indices is None:
+            indices = range(n)
+        x = self.x[:n].tolist()
+        prev_x = self.prev_x[:n].tolist()
+        lefts = self.lefts().tolist()
+        sprites = self.sprites
+        for i in indices:
+            sprite = sprites[i]
+            sprite.prev_x = prev_x[i]
+            sprite.x = x[i]
+            sprite.rect.x = lefts[i]
+    
+    def overlapping(self, rect):
+        """Indices of entities whose rects overlap rect, in slot order"""
+        n = self.count
+        if n == 0 or not rect.width or not rect.height:
+            return []
+        left = self.lefts()
+        top = self.y[:n]
+        hit = ((left < rect.right) & (left + self.width[:n] > rect.left) &
+               (top < rect.bottom) & (top + self.height[:n] > rect.top))
+        return np.flatnonzero(hit).tolist()
+    
+    def positions(self, alpha):
+        """Interpolated (x, y) draw positions, alpha ticks past the last step"""
+        n = self.count
+        prev_x = self.prev_x[:n]
+        x = prev_x + (self.x[:n] - prev_x) * alpha
+        return zip(x.tolist(), self.y[:n].tolist())
+    
+    def clear(self):
+        """Forget every entity"""
+        self.sprites = []
+        self.members.clear()
+        self.count = 0
+
+
+class ScrollingGroup(HashedGroup):
+    """HashedGroup whose members move in one batched NumPy step once it is large
+    
+    Members are Prey / Obstacle sprites, or EntityRecords in headless games.
+    Small groups (or no NumPy) behave exactly like HashedGroup. Large ones
+    keep positions in a ScrollingStore: a tick is a handful of array
+    operations, collisions are tested against the arrays instead of the
+    spatial hash, and sprite x / rect are only written back for collision
+    hits or when something iterates the group.
+    """
+    
+    def __init__(self, *sprites, cell_size=SPATIAL_CELL_SIZE, hash_min=SPATIAL_HASH_MIN,
+                 vector_min=SCROLLING_VECTOR_MIN):
+        self.store = None
+        self.stale = False
+        self.vector_min = vector_min
+        super().__init__(*sprites, cell_size=cell_size, hash_min=hash_min)
+    
+    def __len__(self):
+        # AbstractGroup counts sprites(), which would sync the whole store
+        return len(self.spritedict)
+    
+    def __bool__(self):
+        return bool(self.spritedict)
+    
+    def add_internal(self, sprite, layer=None):
+        if self.store is None:
+            super().add_internal(sprite, layer)
+        else:
+            pygame.sprite.RenderUpdates.add_internal(self, sprite, layer)
+            self.store.add(sprite)
+    
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if self.store is not None:
+            self.store.remove(sprite)
+    
+    def sprites(self):
+        """Member list, with positions synced back from the store first"""
+        if self.stale:
+            self.stale = False
+            self.store.sync()
+        return super().sprites()
+    
+    def kill_all(self):
+        """Kill every member at once, skipping per-sprite store and hash bookkeeping"""
+        self.store = None
+        self.stale = False
+        self.drop_hash()
+        for sprite in self.sprites():
+            sprite.kill()
+    
+    def vectorize(self):
+        """Move members into a ScrollingStore and stop maintaining the hash"""
+        store = ScrollingStore()
+        for sprite in self.sprites():
+            store.add(sprite)
+        self.drop_hash()
+        self.store = store
+    
+    def devectorize(self):
+        """Sync members back from the store; the next update decides whether to hash them"""
+        self.sprites()
+        self.store = None
+        self.queries = 0
+    
+    def update(self, *args, **kwargs):
+        """Advance, cull and (in hash mode) re-bucket every member"""
+        if self.store is None:
+            if np is None or len(self) < self.vector_min:
+                super().update(*args, **kwargs)
+                return
+            self.vectorize()
+        elif len(self.store) < self.vector_min // 2:
+            self.devectorize()
+            super().update(*args, **kwargs)
+            return
         
-        restart_text = self.small_font.render("Press R to Restart", True, WHITE)
+        for sprite in self.store.advance():
+            sprite.kill()
+        self.stale = True
+    
+    def centers(self):
+        """Rect centers of every member, read from the store arrays without syncing sprites"""
+        store = self.store
+        if store is None:
+            return [sprite.rect.center for sprite in self.sprites()]
+        n = store.count
+        return list(zip((store.lefts() + store.width[:n] // 2).tolist(),
+                        (store.y[:n] + store.height[:n] // 2).tolist()))
+    
+    def render_items(self):
+        """(image, prev_x, x, y) for every member in draw order, without syncing sprites"""
+        store = self.store
+        if store is None:
+            return [(sprite.image, sprite.prev_x, sprite.x, sprite.rect.y) for sprite in self.sprites()]
+        n = store.count
+        return list(zip([sprite.image for sprite in store.sprites], store.prev_x[:n].tolist(),
+                        store.x[:n].tolist(), store.y[:n].tolist()))
+    
+    def collide(self, sprite, dokill):
+        """spritecollide() against the store arrays, or through the hash"""
+        store = self.store
+        if store is None:
+            return super().collide(sprite, dokill)
+        indices = store.overlapping(sprite.rect)
+        if not indices:
+            return []
+        store.sync(indices)
+        hits = [store.sprites[i] for i in indices]
+        if dokill:
+            for other in hits:
+                other.kill()
+        return hits
+
+
+class InputState:
+    """Key-state lookup driven by an input bitmask, usable in place of get_pressed()"""
+    
+    KEY_BITS = {
+        pygame.K_LEFT: INPUT_LEFT, pygame.K_a: INPUT_LEFT,
+        pygame.K_RIGHT: INPUT_RIGHT, pygame.K_d: INPUT_RIGHT,
+        pygame.K_UP: INPUT_UP, pygame.K_w: INPUT_UP,
+        pygame.K_DOWN: INPUT_DOWN, pygame.K_s: INPUT_DOWN,
+        pygame.K_SPACE: INPUT_POUNCE,
+    }
+    
+    def __init__(self, mask=0):
+        self.mask = mask
+    
+    def __getitem__(self, key):
+        return bool(self.mask & self.KEY_BITS.get(key, 0))
+
+
+class InputRecorder:
+    """Writes each session's seed and per-tick input masks to a compact binary log
+    
+    The body is run-length encoded as (mask byte, varint run length) pairs, so
+    a session costs a few bytes per input change rather than per tick.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.sessions = 0
+        self.file = None
+        self.mask = None
+        self.run = 0
+    
+    def session_path(self):
+        """First session uses path as given, later ones get a -N suffix"""
+        if self.sessions == 1:
+            return self.path
+        root, ext = os.path.splitext(self.path)
+        return f"{root}-{self.sessions}{ext}"
+    
+    def begin(self, game):
+        """Start a new session log for a freshly reset game"""
+        self.finish()
+        self.sessions += 1
+        settings = dict(game.difficulty, pixel_collisions=game.pixel_collisions)
+        difficulty = json.dumps(settings, sort_keys=True).encode()
+        self.file = open(self.session_path(), 'wb')
+        self.file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, game.session_seed,
+                                           game.tick_rate, len(difficulty)))
+        self.file.write(difficulty)
+    
+    def record(self, mask):
+        """Log the input mask for one simulation tick"""
+        if mask == self.mask:
+            self.run += 1
+            return
+        self.write_run()
+        self.mask = mask
+        self.run = 1
+    
+    def write_run(self):
+        """Append the pending (mask, run length) pair"""
+        if self.file is None or not self.run:
+            return
+        data = bytearray((self.mask,))
+        run = self.run
+        while run >= 0x80:
+            data.append((run & 0x7F) | 0x80)
+            run >>= 7
+        data.append(run)
+        self.file.write(data)
+    
+    def finish(self):
+        """Flush and close the current session log"""
+        if self.file is not None:
+            self.write_run()
+            self.file.close()
+            self.file = None
+        self.mask = None
+        self.run = 0
+    
+    def close(self):
+        """Flush any open session log"""
+        self.finish()
+
+
+class ReplayInput:
+    """Input source that plays back a recorded session log"""
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        
+        magic, version, seed, tick_rate, difficulty_length = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"{path} is not a version {REPLAY_VERSION} replay")
+        offset = REPLAY_HEADER.size
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.difficulty = json.loads(data[offset:offset + difficulty_length])
+        # Logs from before pixel-accurate collisions were played with rect tests
+        self.pixel_collisions = self.difficulty.pop('pixel_collisions', False)
+        offset += difficulty_length
+        
+        # Decode (mask, varint run) pairs
+        self.runs = []
+        while offset < len(data):
+            mask = data[offset]
+            offset += 1
+            run = shift = 0
+            while True:
+                byte = data[offset]
+                offset += 1
+                run |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            self.runs.append((mask, run))
+        
+        self.ticks = sum(run for _, run in self.runs)
+        self.index = 0
+        self.remaining = self.runs[0][1] if self.runs else 0
+    
+    def __call__(self, game):
+        """Mask for the next tick, or None once the log is exhausted"""
+        while self.remaining == 0:
+            self.index += 1
+            if self.index >= len(self.runs):
+                return None
+            self.remaining = self.runs[self.index][1]
+        self.remaining -= 1
+        return self.runs[self.index][0]
+    
+    def make_game(self, headless=True):
+        """A game configured exactly like the recorded session"""
+        return Game(headless=headless, seed=self.seed, difficulty=self.difficulty,
+                    tick_rate=self.tick_rate, input_source=self, pixel_collisions=self.pixel_collisions)
+
+
+class ScriptedInput:
+    """Input source that replays a list of (ticks, mask) segments, then repeats the last mask"""
+    
+    def __init__(self, segments):
+        self.masks = []
+        for ticks, mask in segments:
+            self.masks.extend([mask] * ticks)
+    
+    def __call__(self, game):
+        if not self.masks:
+            return 0
+        index = min(game.ticks, len(self.masks) - 1)
+        return self.masks[index]
+
+
+class TelemetryWriter:
+    """Streams gameplay events to a gzipped JSON-lines file from a background thread
+    
+    record() only appends to a bounded queue, so the frame loop never waits on
+    disk I/O. If the writer falls behind (e.g. a stalled disk) and the queue
+    fills up, new events are dropped and counted instead.
+    """
+    
+    def __init__(self, path, queue_size=TELEMETRY_QUEUE_SIZE, batch_size=TELEMETRY_BATCH_SIZE,
+                 flush_seconds=TELEMETRY_FLUSH_SECONDS):
+        self.path = path
+        self.queue = queue.Queue(queue_size)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.thread = threading.Thread(target=self.write_loop, name="telemetry", daemon=True)
+        self.thread.start()
+    
+    def record(self, event, tick, fields):
+        """Queue one event without blocking; dropped if the queue is full"""
+        try:
+            self.queue.put_nowait((event, tick, fields))
+            self.recorded += 1
+        except queue.Full:
+            self.dropped += 1
+    
+    def write_loop(self):
+        """Writer thread: drain the queue in batches until close() is called"""
+        with gzip.open(self.path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            last_flush = time.monotonic()
+            running = True
+            while running:
+                try:
+                    batch = [self.queue.get(timeout=self.flush_seconds)]
+                except queue.Empty:
+                    batch = []
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                lines = []
+                for item in batch:
+                    if item is None:
+                        running = False
+                        continue
+                    event, tick, fields = item
+                    lines.append(json.dumps(dict(fields, event=event, tick=tick)) + "\n")
+                if lines:
+                    f.write(''.join(lines))
+                    self.written += len(lines)
+                
+                now = time.monotonic()
+                if now - last_flush >= self.flush_seconds:
+                    f.flush()
+                    last_flush = now
+            
+            f.write(json.dumps({'event': 'telemetry_end', 'written': self.written,
+                                'dropped': self.dropped}) + "\n")
+    
+    def close(self, timeout=5.0):
+        """Write out everything queued so far and stop the writer thread"""
+        if not self.thread.is_alive():
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self.thread.join(timeout)
+
+
+class GameSnapshot:
+    """Simulation state at one tick, as plain values and arrays (never surfaces)"""
+    
+    __slots__ = ('ticks', 'game', 'rng', 'jaguar', 'prey', 'obstacles', 'particles')
+    
+    def __init__(self, ticks, game, rng, jaguar, prey, obstacles, particles):
+        self.ticks = ticks
+        self.game = game
+        self.rng = rng
+        self.jaguar = jaguar
+        self.prey = prey
+        self.obstacles = obstacles
+        self.particles = particles
+
+
+class SnapshotRing:
+    """The most recent snapshots, oldest dropped first"""
+    
+    def __init__(self, capacity=SNAPSHOT_RING_SIZE):
+        self.snapshots = deque(maxlen=capacity)
+    
+    def __len__(self):
+        return len(self.snapshots)
+    
+    def push(self, snapshot):
+        self.snapshots.append(snapshot)
+    
+    def find(self, ticks):
+        """Newest snapshot taken at or before ticks, else the oldest one kept"""
+        for snapshot in reversed(self.snapshots):
+            if snapshot.ticks <= ticks:
+                return snapshot
+        return self.snapshots[0] if self.snapshots else None
+    
+    def truncate(self, ticks):
+        """Drop snapshots newer than ticks (that timeline was rewound away)"""
+        snapshots = self.snapshots
+        while snapshots and snapshots[-1].ticks > ticks:
+            snapshots.pop()
+    
+    def clear(self):
+        self.snapshots.clear()
+
+
+class RenderSnapshot:
+    """Everything the renderer needs for one simulated tick; never mutated once published"""
+    
+    __slots__ = ('ticks', 'time', 'state', 'sprites', 'jaguar', 'particles', 'hud', 'counts')
+    
+    def __init__(self, ticks, time, state, sprites, jaguar, particles, hud, counts):
+        self.ticks = ticks
+        self.time = time
+        self.state = state
+        self.sprites = sprites
+        self.jaguar = jaguar
+        self.particles = particles
+        self.hud = hud
+        # (prey, trees, particles) for the profiler overlay
+        self.counts = counts
+
+
+class RenderBuffer:
+    """Hands the newest render snapshot from the simulation thread to the renderer
+    
+    Snapshots are immutable, so publishing is a reference swap: the
+    simulation never waits on a frame and the renderer always picks up the
+    newest complete snapshot, which is what a triple buffer provides.
+    Also counts how often the renderer falls behind the simulation.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latest = None
+        self.published = 0
+        self.frames = 0
+        self.last_ticks = None
+        # Frames that skipped simulated ticks / showed no new tick
+        self.lagged = 0
+        self.skipped = 0
+        self.repeated = 0
+    
+    def publish(self, snapshot):
+        with self.lock:
+            self.latest = snapshot
+            self.published += 1
+    
+    def take(self):
+        """The newest snapshot (or None), updating the lag counters"""
+        with self.lock:
+            snapshot = self.latest
+        if snapshot is None or snapshot.state != PLAYING:
+            self.last_ticks = None
+            return snapshot
+        
+        self.frames += 1
+        if self.last_ticks is not None:
+            behind = snapshot.ticks - self.last_ticks
+            if behind == 0:
+                self.repeated += 1
+            elif behind > 1:
+                self.lagged += 1
+                self.skipped += behind - 1
+        self.last_ticks = snapshot.ticks
+        return snapshot
+    
+    def report(self):
+        """One-line summary of renderer lag"""
+        frames = max(1, self.frames)
+        return (f"Pipelined: {self.frames} frames while playing, renderer lagged the simulation on "
+                f"{self.lagged} ({self.lagged / frames:.1%}) skipping {self.skipped} ticks, "
+                f"repeated a tick on {self.repeated} ({self.repeated / frames:.1%})")
+
+
+class FrameGovernor:
+    """Lowers effects quality when frames miss their budget, raising it again once there is headroom
+    
+    Decisions are made once per window of frames. One window with a few missed
+    frames drops a level, while raising one takes several calm windows in a
+    row, so quality doesn't flap around the budget.
+    """
+    
+    def __init__(self, budget_ms=1000 / FPS, levels=QUALITY_LEVELS, window=GOVERNOR_WINDOW,
+                 downgrade_misses=GOVERNOR_DOWNGRADE_MISSES, upgrade_headroom=GOVERNOR_UPGRADE_HEADROOM,
+                 upgrade_windows=GOVERNOR_UPGRADE_WINDOWS):
+        self.budget_ms = budget_ms
+        self.levels = levels
+        self.window = window
+        self.downgrade_misses = downgrade_misses
+        self.upgrade_headroom = upgrade_headroom
+        self.upgrade_windows = upgrade_windows
+        self.adaptive = True
+        self.level = len(levels) - 1
+        self.settings = levels[self.level]
+        self.transitions = []
+        self.frames = 0
+        self.misses = 0
+        self.slowest = 0.0
+        self.calm_windows = 0
+    
+    @property
+    def name(self):
+        """Name of the current quality level"""
+        return self.settings['name']
+    
+    def observe(self, frame_ms):
+        """Account one frame's work time; True when the quality level changed"""
+        self.frames += 1
+        if frame_ms > self.budget_ms:
+            self.misses += 1
+        if frame_ms > self.slowest:
+            self.slowest = frame_ms
+        if self.frames < self.window:
+            return False
+        
+        changed = False
+        if self.misses >= self.downgrade_misses:
+            self.calm_windows = 0
+            if self.level > 0:
+                changed = self.set_level(self.level - 1, f"{self.misses}/{self.frames} frames over budget")
+        elif self.slowest <= self.budget_ms * self.upgrade_headroom:
+            self.calm_windows += 1
+            if self.calm_windows >= self.upgrade_windows and self.level < len(self.levels) - 1:
+                self.calm_windows = 0
+                changed = self.set_level(self.level + 1, f"slowest frame {self.slowest:.1f} ms")
+        else:
+            self.calm_windows = 0
+        
+        self.frames = self.misses = 0
+        self.slowest = 0.0
+        return changed
+    
+    def set_level(self, level, reason="fixed"):
+        """Switch to a quality level, logging the transition; False if already there"""
+        if level == self.level:
+            return False
+        previous = self.settings['name']
+        self.level = level
+        self.settings = self.levels[level]
+        self.transitions.append((time.perf_counter(), previous, self.settings['name'], reason))
+        return True
+
+
+class FrameProfiler:
+    """Per-phase frame timings in a fixed-size ring buffer
+    
+    Phases are timed by wrapping the game's phase methods on the instance
+    while enabled; when disabled nothing is wrapped, so the only cost left
+    in the frame loop is one attribute check.
+    """
+    
+    PHASES = ('handle_events', 'update', 'update_jaguar', 'spawn_entities', 'update_entities',
+              'check_collisions', 'draw', 'draw_background', 'draw_sprites', 'draw_ui', 'present')
+    
+    def __init__(self, capacity=PROFILE_FRAMES):
+        self.capacity = capacity
+        self.frames = [None] * capacity
+        self.index = 0
+        self.count = 0
+        self.enabled = False
+        self.target = None
+        self.frame_start = 0
+        self.spans = []
+    
+    def enable(self, game):
+        """Start timing the game's phases"""
+        if self.enabled:
+            return
+        for name in self.PHASES:
+            setattr(game, name, self.wrap(name, getattr(game, name)))
+        self.target = game
+        self.enabled = True
+        self.frame_start = time.perf_counter_ns()
+        self.spans = []
+    
+    def disable(self):
+        """Remove every wrapper, restoring the plain methods"""
+        if not self.enabled:
+            return
+        for name in self.PHASES:
+            delattr(self.target, name)
+        self.target = None
+        self.enabled = False
+    
+    def wrap(self, name, method):
+        """Time every call of a bound method"""
+        clock = time.perf_counter_ns
+        
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.spans.append((name, start, clock()))
+        return timed
+    
+    def end_frame(self):
+        """Close the current frame and store it in the ring buffer"""
+        now = time.perf_counter_ns()
+        self.frames[self.index] = (self.frame_start, now, self.spans)
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frame_start = now
+        self.spans = []
+    
+    def recent(self):
+        """Stored frames, oldest first"""
+        if self.count < self.capacity:
+            return self.frames[:self.count]
+        return self.frames[self.index:] + self.frames[:self.index]
+    
+    def percentiles(self, values, points=(0.5, 0.95, 0.99)):
+        ordered = sorted(values)
+        if not ordered:
+            return [0.0 for _ in points]
+        return [ordered[min(len(ordered) - 1, int(p * len(ordered)))] for p in points]
+    
+    def frame_times(self):
+        """p50/p95/p99 frame time in ms"""
+        return self.percentiles([(end - start) / 1e6 for start, end, _ in self.recent()])
+    
+    def phase_times(self, names=('handle_events', 'update', 'draw')):
+        """p50 per-frame total (ms) of the given phases"""
+        totals = {name: [] for name in names}
+        for _, _, spans in self.recent():
+            frame = dict.fromkeys(names, 0)
+            for name, start, end in spans:
+                if name in frame:
+                    frame[name] += end - start
+            for name in names:
+                totals[name].append(frame[name] / 1e6)
+        return {name: self.percentiles(values, (0.5,))[0] for name, values in totals.items()}
+    
+    def export_chrome_trace(self, path):
+        """Write the ring buffer as Chrome trace-event JSON (chrome://tracing, Perfetto)"""
+        events = []
+        for frame_number, (start, end, spans) in enumerate(self.recent()):
+            events.append({'name': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1,
+                           'ts': start / 1000, 'dur': (end - start) / 1000,
+                           'args': {'frame': frame_number}})
+            for name, span_start, span_end in spans:
+                events.append({'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+                               'ts': span_start / 1000, 'dur': (span_end - span_start) / 1000})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+class Game:
+    """Main game class"""
+    
+    def __init__(self, tail_buckets=TAIL_PHASE_BUCKETS, dirty_rects=False,
+                 headless=False, seed=None, input_source=None, difficulty=None,
+                 spatial_hash=True, tick_rate=TICK_RATE, max_fps=FPS, record_path=None,
+                 profile=False, trace_path=None, snapshot_interval=SNAPSHOT_INTERVAL,
+                 pipelined=False, screen=None, telemetry_path=None, quality=None,
+                 render_scale=1.0, native_hud=True, smooth_upscale=False, pixel_collisions=True):
+        created = time.perf_counter()
+        
+        # Headless games never open a window; they only run the simulation
+        self.headless = headless
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.input_source = input_source
+        self.ticks = 0
+        self.pending_pounce = False
+        self.sessions_started = 0
+        self.session_seed = seed
+        self.recorder = InputRecorder(record_path) if record_path else None
+        self.telemetry = TelemetryWriter(telemetry_path) if telemetry_path else None
+        # Live spectator feed (see jaguar_spectate.py): anything with publish(game)
+        self.spectators = None
+        
+        # Effects quality follows the frame budget unless a level is given
+        self.governor = FrameGovernor()
+        self.text_shadows = True
+        
+        # Rewind history: a snapshot every snapshot_interval ticks (0 = off)
+        self.snapshot_interval = snapshot_interval
+        self.snapshots = SnapshotRing()
+        
+        # Frame profiler: F3 toggles timing + overlay, F4 dumps a trace
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        self.profiler_lines = []
+        self.trace_path = trace_path
+        # --profile times every frame from the start, overlay or not
+        self.profile_always = profile
+        if profile:
+            self.profiler.enable(self)
+        self.difficulty = dict(DIFFICULTY, **(difficulty or {}))
+        
+        self.clock = pygame.time.Clock()
+        self.tick_rate = tick_rate
+        self.max_fps = max_fps
+        # Fraction of a tick between the last simulation step and the frame being drawn
+        self.alpha = 1.0
+        
+        # Pipelined mode: the simulation runs on its own thread; the main thread
+        # pumps events, queues state changes for it and renders its snapshots
+        self.pipelined = pipelined
+        self.actions = queue.SimpleQueue()
+        self.render_buffer = RenderBuffer()
+        self.held_mask = 0
+        self.simulating = False
+        # Only the display is started, and only with a window; fonts load on
+        # first draw and the mixer is never opened since nothing plays sound.
+        # A screen surface passed in is drawn to offscreen instead of a window.
+        self.offscreen = screen is not None
+        if headless:
+            self.screen = None
+        elif screen is not None:
+            self.screen = screen
+        else:
+            pygame.display.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            type_images.invalidate()
+            pygame.display.set_caption("Jaguar Hunt Game")
+        
+        # Render scale: below 1.0 the background and sprites are drawn into a
+        # smaller canvas that one scale blit stretches over the window; the
+        # HUD is drawn at window resolution on top unless native_hud is off
+        self.display = self.screen
+        self.world = self.hud = self.screen
+        self.canvas = None
+        self.render_scale = 1.0
+        self.native_hud = native_hud
+        self.smooth_upscale = smooth_upscale
+        self.fonts = {}
+        self.text_cache = TextCache()
+        
+        # Static background is rendered once; dirty-rect mode pushes only
+        # the regions that changed instead of flipping the whole window
+        self.background = None
+        self.use_dirty_rects = dirty_rects
+        self.dirty_regions = []
+        self.needs_full_redraw = True
+        
+        # Jaguar poses are rendered when play starts and reused across restarts
+        self.jaguar_atlas = JaguarAtlas(60, 50, tail_buckets)
+        
+        self.state = MENU
+        self.score = 0
+        self.lives = 3
+        self.high_score = 0
+        
+        # Sprite groups
+        self.all_sprites = pygame.sprite.Group()
+        self.use_spatial_hash = spatial_hash
+        # Rect hits are confirmed against the sprites' shared masks
+        self.pixel_collisions = pixel_collisions
+        self.prey_group = ScrollingGroup()
+        self.obstacle_group = ScrollingGroup()
+        self.particle_group = pygame.sprite.RenderUpdates()
+        
+        # Vectorized particles when NumPy is available, sprites otherwise
+        self.particles = ParticleSystem(seed=seed) if np is not None else None
+        # Sprite particles draw from their own stream: effects are skipped
+        # headless and scaled by quality, so they must not shift the simulation's
+        self.particle_rng = random.Random(seed)
+        
+        # Spawned entities are recycled through pools instead of reallocated.
+        # Headless games simulate sprite-free records: nothing draws them
+        if headless:
+            self.prey_pool = EntityPool(PreyRecord)
+            self.obstacle_pool = EntityPool(TreeRecord)
+        else:
+            self.prey_pool = EntityPool(Prey)
+            self.obstacle_pool = EntityPool(Obstacle)
+        self.particle_pool = EntityPool(Particle)
+        self.prey_pool.prewarm(PREY_POOL_PREWARM)
+        self.obstacle_pool.prewarm(OBSTACLE_POOL_PREWARM)
+        if self.particles is None and not headless:
+            self.particle_pool.prewarm(PARTICLE_POOL_PREWARM, 0, 0, GOLD)
+        
+        self.jaguar = None
+        self.spawn_timer = 0
+        self.difficulty_timer = 0
+        self.spawn_rate = self.difficulty['spawn_rate_start']
+        if quality is not None:
+            self.set_quality(quality)
+        self.set_render_scale(render_scale)
+        
+        # Startup cost, reported once the first frame is on screen
+        self.report_startup = False
+        self.startup = {
+            'import_ms': IMPORT_SECONDS * 1000,
+            'init_ms': (time.perf_counter() - created) * 1000,
+            'first_frame_ms': None,
+        }
+        
+    @property
+    def font(self):
+        """Large UI font, loaded on first use"""
+        return self.load_font(48)
+    
+    @property
+    def small_font(self):
+        """Small UI font, loaded on first use"""
+        return self.load_font(32)
+    
+    def load_font(self, size):
+        """Default font at a size, starting the font module if needed"""
+        font = self.fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+    
+    def kill_entities(self):
+        """Kill every prey, tree and particle, returning them to their pools"""
+        self.prey_group.kill_all()
+        self.obstacle_group.kill_all()
+        for sprite in self.particle_group.sprites():
+            sprite.kill()
+    
+    def reset_game(self):
+        """Reset game state"""
+        self.kill_entities()
+        self.all_sprites.empty()
+        if self.particles is not None:
+            self.particles.clear()
+        
+        self.score = 0
+        self.lives = 3
+        self.spawn_timer = 0
+        self.difficulty_timer = 0
+        self.spawn_rate = self.difficulty['spawn_rate_start']
+        self.ticks = 0
+        self.pending_pounce = False
+        
+        # Every session starts from its own seed so it can be replayed on its own
+        if self.seed is None:
+            self.session_seed = random.getrandbits(63)
+        else:
+            self.session_seed = self.seed + self.sessions_started
+        self.sessions_started += 1
+        self.rng.seed(self.session_seed)
+        # Effects restart from the session seed too, so a session renders the same every time
+        self.particle_rng.seed(self.session_seed)
+        if self.particles is not None:
+            self.particles.reseed(self.session_seed)
+        
+        if not self.headless:
+            self.jaguar_atlas.prerender()
+        self.jaguar = Jaguar(100, SCREEN_HEIGHT // 2, self.jaguar_atlas)
+        self.all_sprites.add(self.jaguar)
+        
+        self.state = PLAYING
+        if self.recorder:
+            self.recorder.begin(self)
+        self.log_event('session_start', seed=self.session_seed, time=time.time(),
+                       difficulty=self.difficulty)
+        
+        self.snapshots.clear()
+        if self.snapshot_interval:
+            self.snapshots.push(self.snapshot())
+    
+    def snapshot(self):
+        """Capture the simulation state for rewind / retry"""
+        if self.particles is not None:
+            particles = self.particles.snapshot()
+        else:
+            particles = [particle.snapshot() for particle in self.particle_group]
+        return GameSnapshot(
+            self.ticks,
+            (self.score, self.lives, self.spawn_timer, self.difficulty_timer,
+             self.spawn_rate, self.session_seed),
+            self.rng.getstate(),
+            self.jaguar.snapshot(),
+            [prey.snapshot() for prey in self.prey_group],
+            [obstacle.snapshot() for obstacle in self.obstacle_group],
+            particles,
+        )
+    
+    def restore(self, snapshot):
+        """Rebuild the simulation from a snapshot, reusing pooled entities and cached art"""
+        self.kill_entities()
+        
+        # Fresh allocations draw from the RNG; its state is restored afterwards
+        for state in snapshot.prey:
+            self.add_entity(self.prey_pool.restore(state, self.rng), self.prey_group)
+        for state in snapshot.obstacles:
+            self.add_entity(self.obstacle_pool.restore(state, self.rng), self.obstacle_group)
+        if self.particles is not None:
+            self.particles.restore(snapshot.particles)
+        else:
+            for state in snapshot.particles:
+                self.particle_group.add(self.particle_pool.restore(state, 0, 0, GOLD, self.particle_rng))
+        
+        self.jaguar.restore(snapshot.jaguar)
+        (self.score, self.lives, self.spawn_timer, self.difficulty_timer,
+         self.spawn_rate, self.session_seed) = snapshot.game
+        self.rng.setstate(snapshot.rng)
+        self.ticks = snapshot.ticks
+        self.pending_pounce = False
+        self.state = PLAYING
+        self.needs_full_redraw = True
+        self.snapshots.truncate(snapshot.ticks)
+        
+        # A replay can't reproduce a rewound session, so its log ends here
+        if self.recorder:
+            self.recorder.finish()
+    
+    def rewind(self, seconds=REWIND_SECONDS):
+        """Jump back to the newest snapshot at least seconds old; False if there is none"""
+        snapshot = self.snapshots.find(self.ticks - int(seconds * self.tick_rate))
+        if snapshot is None:
+            return False
+        # Logged at the tick being left, so the event stream stays in order
+        self.log_event('rewind', rewound_to=snapshot.ticks)
+        self.restore(snapshot)
+        return True
+    
+    def add_entity(self, entity, group):
+        """Put a spawned prey or tree in its group, and in all_sprites unless it is a record"""
+        group.add(entity)
+        if not self.headless:
+            self.all_sprites.add(entity)
+    
+    def log_event(self, event, **fields):
+        """Send a gameplay event to telemetry, if a stream is open"""
+        if self.telemetry:
+            self.telemetry.record(event, self.ticks, fields)
+    
+    def spawn_particles(self, x, y, color, count):
+        """Emit a burst of effect particles"""
+        if self.headless:
+            # Particles are purely cosmetic
+            return
+        count = max(1, round(count * self.governor.settings['particles']))
+        if self.particles is not None:
+            self.particles.emit(x, y, color, count)
+        else:
+            for _ in range(count):
+                self.particle_group.add(self.particle_pool.acquire(x, y, color, self.particle_rng))
+    
+    def pool_stats(self):
+        """Occupancy and allocation counters for every entity pool"""
+        stats = {
+            'prey': self.prey_pool.stats(),
+            'obstacle': self.obstacle_pool.stats(),
+            'particle': self.particle_pool.stats(),
+        }
+        if self.particles is not None:
+            stats['particle_system'] = {
+                'live': len(self.particles),
+                'capacity': self.particles.capacity,
+                'dropped': self.particles.dropped,
+            }
+        return stats
+    
+    def get_background(self):
+        """Return the cached background, rendering it on first use"""
+        if self.background is None:
+            background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                background = background.convert()
+            
+            # Sky
+            background.fill(SKY_BLUE)
+            
+            # Grass
+            pygame.draw.rect(background, GRASS_GREEN, 
+                            (0, SCREEN_HEIGHT - 80, SCREEN_WIDTH, 80))
+            
+            # Grass details
+            for i in range(0, SCREEN_WIDTH, 20):
+                pygame.draw.line(background, DARK_GREEN, 
+                               (i, SCREEN_HEIGHT - 80), 
+                               (i, SCREEN_HEIGHT - 70), 2)
+            
+            self.background = background
+        return self.background
+    
+    def draw_background(self):
+        """Draw game background"""
+        self.world.blit(self.get_background(), (0, 0))
+    
+    def hud_values(self):
+        """Score, lives, high score and pounce cooldown as shown by the HUD"""
+        cooldown = self.jaguar.pounce_cooldown if self.jaguar else 0
+        return (self.score, self.lives, self.high_score, cooldown)
+    
+    def draw_ui(self, hud=None):
+        """Draw UI elements, returning the screen areas touched"""
+        rects = []
+        score, lives, high_score, cooldown = hud or self.hud_values()
+        
+        text_cache = self.text_cache
+        
+        render = text_cache.render_shadowed if self.text_shadows else text_cache.render
+        
+        # Score
+        score_text = render(self.small_font, f"Score: {score}", WHITE)
+        rects.append(self.hud.blit(score_text, (20, 10)))
+        
+        # Lives
+        lives_text = render(self.small_font, f"Lives: {lives}", WHITE)
+        rects.append(self.hud.blit(lives_text, (20, 45)))
+        
+        # High Score
+        high_text = text_cache.render(self.small_font, f"High: {high_score}", GOLD)
+        rects.append(self.hud.blit(high_text, (SCREEN_WIDTH - 180, 10)))
+        
+        # Pounce cooldown indicator
+        if cooldown > 0:
+            cooldown_width = 100
+            cooldown_height = 10
+            cooldown_x = SCREEN_WIDTH // 2 - cooldown_width // 2
+            cooldown_y = SCREEN_HEIGHT - 30
+            
+            rects.append(self.hud.fill(BLACK, 
+                         (cooldown_x - 2, cooldown_y - 2, cooldown_width + 4, cooldown_height + 4)))
+            
+            fill_width = cooldown_width * (1 - cooldown / 30)
+            self.hud.fill(ORANGE, (cooldown_x, cooldown_y, fill_width, cooldown_height))
+        else:
+            ready_text = text_cache.render(self.small_font, "POUNCE READY!", GOLD)
+            text_rect = ready_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 25))
+            rects.append(self.hud.blit(ready_text, text_rect))
+        
+        return rects
+    
+    def draw_menu(self):
+        """Draw main menu"""
+        self.draw_background()
+        self.finish_world()
+        
+        title = self.text_cache.render_shadowed(self.font, "JAGUAR HUNT", GOLD, offset=3)
+        title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 150))
+        self.hud.blit(title, title_rect)
+        
+        instructions = [
+            "Press SPACE to Start",
+            "",
+            "Controls:",
+            "Arrow Keys / WASD - Move",
+            "SPACE - Pounce",
+            "ESC - Pause",
+            "",
+            "Hunt prey, avoid obstacles!"
+        ]
+        
+        y_offset = 280
+        for line in instructions:
+            text = self.text_cache.render(self.small_font, line, WHITE)
+            text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
+            self.hud.blit(text, text_rect)
+            y_offset += 40
+    
+    def draw_game_over(self):
+        """Draw game over screen"""
+        self.draw_background()
+        self.finish_world()
+        
+        game_over_text = self.text_cache.render_shadowed(self.font, "GAME OVER", RED, offset=3)
+        text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, 200))
+        self.hud.blit(game_over_text, text_rect)
+        
+        score_text = self.text_cache.render(self.small_font, f"Final Score: {self.score}", WHITE)
+        score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, 300))
+        self.hud.blit(score_text, score_rect)
+        
+        high_text = self.text_cache.render(self.small_font, f"High Score: {self.high_score}", GOLD)
+        high_rect = high_text.get_rect(center=(SCREEN_WIDTH // 2, 350))
+        self.hud.blit(high_text, high_rect)
+        
+        restart_text = self.text_cache.render(self.small_font, "Press R to Restart", WHITE)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, 450))
-        self.screen.blit(restart_text, restart_rect)
+        self.hud.blit(restart_text, restart_rect)
+        
+        if self.snapshots:
+            retry_text = self.text_cache.render(self.small_font,
+                                                f"Press BACKSPACE to retry from {REWIND_SECONDS} s ago", WHITE)
+            retry_rect = retry_text.get_rect(center=(SCREEN_WIDTH // 2, 500))
+            self.hud.blit(retry_text, retry_rect)
     
     def handle_events(self):
         """Handle game events"""
@@ -468,137 +2486,712 @@ class Game:
                 return False
             
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.toggle_profiler()
+                elif event.key == pygame.K_F5:
+                    self.cycle_render_scale()
+                elif event.key == pygame.K_F4 and self.profiler.count:
+                    path = self.trace_path or time.strftime("jaguar_trace_%Y%m%d_%H%M%S.json")
+                    self.profiler.export_chrome_trace(path)
+                
                 if self.state == MENU:
                     if event.key == pygame.K_SPACE:
-                        self.reset_game()
+                        self.queue_action(self.reset_game)
                 
                 elif self.state == PLAYING:
                     if event.key == pygame.K_SPACE:
-                        if self.jaguar and self.jaguar.pounce():
-                            # Create pounce particles
-                            for _ in range(10):
-                                particle = Particle(self.jaguar.x + self.jaguar.width // 2,
-                                                  self.jaguar.y + self.jaguar.height // 2,
-                                                  GOLD)
-                                self.particle_group.add(particle)
+                        # Applied on the next simulation tick
+                        self.queue_action(self.request_pounce)
                     
                     if event.key == pygame.K_ESCAPE:
-                        self.state = PAUSED
+                        self.queue_action(self.toggle_pause)
                 
                 elif self.state == GAME_OVER:
                     if event.key == pygame.K_r:
-                        self.reset_game()
+                        self.queue_action(self.reset_game)
                 
                 elif self.state == PAUSED:
                     if event.key == pygame.K_ESCAPE:
-                        self.state = PLAYING
+                        self.queue_action(self.toggle_pause)
+                
+                # Rewind / retry from a few seconds ago
+                if event.key == pygame.K_BACKSPACE and self.state in (PLAYING, PAUSED, GAME_OVER):
+                    self.queue_action(self.rewind)
         
         return True
     
-    def update(self):
+    def queue_action(self, action):
+        """Apply a state change now, or between ticks when the simulation has its own thread"""
+        if self.simulating:
+            self.actions.put(action)
+        else:
+            action()
+    
+    def request_pounce(self):
+        """Pounce on the next simulation tick"""
+        self.pending_pounce = True
+    
+    def toggle_pause(self):
+        """Pause a running game or resume a paused one"""
+        if self.state == PLAYING:
+            self.state = PAUSED
+            self.log_event('pause')
+        elif self.state == PAUSED:
+            self.state = PLAYING
+            self.log_event('resume')
+    
+    def toggle_profiler(self):
+        """Show/hide the profiler overlay, timing phases only while it is shown"""
+        self.show_profiler = not self.show_profiler
+        self.profiler_lines = []
+        if self.show_profiler:
+            self.profiler.enable(self)
+        elif not (self.profile_always or self.trace_path):
+            self.profiler.disable()
+        self.needs_full_redraw = True
+    
+    def try_pounce(self):
+        """Start a pounce if the jaguar is ready"""
+        if self.jaguar and self.jaguar.pounce():
+            self.log_event('pounce', x=self.jaguar.x, y=self.jaguar.y)
+            # Create pounce particles
+            self.spawn_particles(self.jaguar.x + self.jaguar.width // 2,
+                                 self.jaguar.y + self.jaguar.height // 2,
+                                 GOLD, 10)
+            return True
+        return False
+    
+    def held_input(self):
+        """Bitmask of the movement keys currently held"""
+        keys = pygame.key.get_pressed()
+        mask = 0
+        for key, bit in InputState.KEY_BITS.items():
+            if bit != INPUT_POUNCE and keys[key]:
+                mask |= bit
+        return mask
+    
+    def poll_input(self):
+        """Input bitmask for the next tick from held keys and queued key presses"""
+        # Off the main thread, use the keys the renderer last saw held
+        mask = self.held_mask if self.simulating else self.held_input()
+        if self.pending_pounce:
+            mask |= INPUT_POUNCE
+            self.pending_pounce = False
+        return mask
+    
+    def tick(self):
+        """Run one simulation tick from the keyboard or the configured input source"""
+        if self.state != PLAYING:
+            return
+        if self.input_source is not None:
+            mask = self.input_source(self)
+            if mask is None:
+                # Input exhausted (end of a replay)
+                return
+        else:
+            mask = self.poll_input()
+        self.step(mask)
+    
+    def step(self, mask=0):
+        """Advance the simulation by one tick using an input bitmask"""
+        if self.state != PLAYING:
+            return
+        if self.recorder:
+            self.recorder.record(mask)
+        if mask & INPUT_POUNCE:
+            self.try_pounce()
+        self.update(InputState(mask))
+        
+        interval = self.snapshot_interval
+        if interval and self.ticks % interval == 0 and self.state == PLAYING:
+            self.snapshots.push(self.snapshot())
+        if self.spectators:
+            self.spectators.publish(self)
+    
+    def update(self, keys=None):
         """Update game state"""
         if self.state != PLAYING:
             return
         
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        self.ticks += 1
         
-        # Update jaguar
+        self.update_jaguar(keys)
+        self.spawn_entities()
+        self.update_entities()
+        self.check_collisions()
+        self.update_difficulty()
+    
+    def update_jaguar(self, keys):
+        """Move the jaguar and advance its pounce timers"""
         if self.jaguar:
             self.jaguar.update(keys)
-        
-        # Spawn enemies
+    
+    def spawn_entities(self):
+        """Spawn prey or a tree whenever the spawn timer runs out"""
         self.spawn_timer += 1
         if self.spawn_timer >= self.spawn_rate:
             self.spawn_timer = 0
             
-            if random.random() < 0.7:
-                prey = Prey()
-                self.prey_group.add(prey)
-                self.all_sprites.add(prey)
+            if self.rng.random() < self.difficulty['prey_chance']:
+                prey = self.prey_pool.acquire(self.rng)
+                self.add_entity(prey, self.prey_group)
+                self.log_event('spawn', kind='prey', type=prey.type, y=prey.y)
             else:
-                obstacle = Obstacle()
-                self.obstacle_group.add(obstacle)
-                self.all_sprites.add(obstacle)
-        
-        # Update sprites
+                obstacle = self.obstacle_pool.acquire(self.rng)
+                self.add_entity(obstacle, self.obstacle_group)
+                self.log_event('spawn', kind='obstacle', y=obstacle.y)
+    
+    def update_entities(self):
+        """Move every prey, obstacle and particle"""
         self.prey_group.update()
         self.obstacle_group.update()
-        self.particle_group.update()
-        
+        if self.particles is not None:
+            self.particles.update()
+        else:
+            self.particle_group.update()
+    
+    def check_collisions(self):
+        """Resolve catches and obstacle hits"""
         # Check collisions with prey
         if self.jaguar and self.jaguar.pouncing:
-            caught_prey = pygame.sprite.spritecollide(self.jaguar, self.prey_group, True)
+            caught_prey = self.collide(self.jaguar, self.prey_group, True)
             for prey in caught_prey:
                 self.score += prey.points
+                self.log_event('catch', type=prey.type, points=prey.points, score=self.score)
                 # Create catch particles
-                for _ in range(15):
-                    particle = Particle(prey.rect.centerx, prey.rect.centery, GOLD)
-                    self.particle_group.add(particle)
+                self.spawn_particles(prey.rect.centerx, prey.rect.centery, GOLD, 15)
         
         # Check collisions with obstacles
         if self.jaguar:
-            hit_obstacles = pygame.sprite.spritecollide(self.jaguar, self.obstacle_group, True)
+            hit_obstacles = self.collide(self.jaguar, self.obstacle_group, True)
             if hit_obstacles:
                 self.lives -= 1
+                self.log_event('hit', lives=self.lives)
                 # Create damage particles
-                for _ in range(20):
-                    particle = Particle(self.jaguar.x + self.jaguar.width // 2,
-                                      self.jaguar.y + self.jaguar.height // 2,
-                                      RED)
-                    self.particle_group.add(particle)
+                self.spawn_particles(self.jaguar.x + self.jaguar.width // 2,
+                                     self.jaguar.y + self.jaguar.height // 2,
+                                     RED, 20)
                 
                 if self.lives <= 0:
                     if self.score > self.high_score:
                         self.high_score = self.score
                     self.state = GAME_OVER
-        
-        # Increase difficulty
+                    self.log_event('game_over', score=self.score, high_score=self.high_score)
+    
+    def update_difficulty(self):
+        """Speed up spawning as the session goes on"""
+        difficulty = self.difficulty
         self.difficulty_timer += 1
-        if self.difficulty_timer >= 300:
+        if self.difficulty_timer >= difficulty['difficulty_interval']:
             self.difficulty_timer = 0
-            self.spawn_rate = max(30, self.spawn_rate - 2)
+            spawn_rate = max(difficulty['spawn_rate_min'],
+                             self.spawn_rate - difficulty['spawn_rate_step'])
+            if spawn_rate != self.spawn_rate:
+                self.spawn_rate = spawn_rate
+                self.log_event('difficulty', spawn_rate=spawn_rate)
+    
+    def collide(self, sprite, group, dokill):
+        """Sprites in group overlapping sprite, via group.collide() when the spatial hash is enabled
+        
+        That only hashes groups with SPATIAL_HASH_MIN+ members queried
+        SPATIAL_HASH_QUERIES+ times per tick; play makes one query per group
+        per tick, so there it always tests members linearly (or against the
+        batched arrays of a large ScrollingGroup).
+        
+        With pixel collisions the rect hits are only candidates; a pair counts
+        once the sprites' masks overlap.
+        """
+        if not self.pixel_collisions:
+            if self.use_spatial_hash:
+                return group.collide(sprite, dokill)
+            return pygame.sprite.spritecollide(sprite, group, dokill)
+        
+        if self.use_spatial_hash:
+            candidates = group.collide(sprite, False)
+        else:
+            candidates = pygame.sprite.spritecollide(sprite, group, False)
+        if not candidates:
+            return candidates
+        mask = sprite.mask
+        left, top = sprite.rect.topleft
+        hits = [other for other in candidates
+                if mask.overlap(other.mask, (other.rect.x - left, other.rect.y - top))]
+        if dokill:
+            for other in hits:
+                other.kill()
+        return hits
     
     def draw(self):
         """Draw everything"""
+        if self.headless:
+            return
         if self.state == MENU:
             self.draw_menu()
         elif self.state == GAME_OVER:
             self.draw_game_over()
+        elif self.use_dirty_rects and self.state == PLAYING and self.canvas is None:
+            self.draw_dirty()
+            return
         else:
             self.draw_background()
-            
-            # Draw sprites
-            self.prey_group.draw(self.screen)
-            self.obstacle_group.draw(self.screen)
-            self.particle_group.draw(self.screen)
-            
-            if self.jaguar:
-                self.screen.blit(self.jaguar.image, self.jaguar.rect)
-            
+            self.draw_sprites()
+            self.finish_world()
             self.draw_ui()
             
             if self.state == PAUSED:
-                pause_text = self.font.render("PAUSED", True, WHITE)
-                pause_shadow = self.font.render("PAUSED", True, BLACK)
-                text_rect = pause_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-                self.screen.blit(pause_shadow, (text_rect.x + 3, text_rect.y + 3))
-                self.screen.blit(pause_text, text_rect)
+                self.draw_paused()
+        
+        if self.show_profiler:
+            self.draw_profiler_overlay()
+        self.present()
+        self.needs_full_redraw = True
+    
+    def draw_paused(self):
+        """Draw the pause banner"""
+        pause_text = self.text_cache.render_shadowed(self.font, "PAUSED", WHITE, offset=3)
+        text_rect = pause_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        self.hud.blit(pause_text, text_rect)
+    
+    def present(self, rects=None):
+        """Push the frame to the display: a full flip, or only the given rects"""
+        if self.canvas is not None and self.hud is not self.display:
+            self.upscale()
+        if self.offscreen:
+            pass
+        elif rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        if self.startup['first_frame_ms'] is None:
+            self.record_first_frame()
+    
+    def set_render_scale(self, scale):
+        """Draw the world at a fraction of the window resolution (1.0 = native)"""
+        if self.display is None:
+            return
+        self.render_scale = scale
+        if scale == 1.0:
+            self.canvas = None
+            self.screen = self.world = self.hud = self.display
+        else:
+            self.canvas = ScaledCanvas(self.display, scale)
+            self.screen = self.canvas.surface
+            self.world = self.canvas
+            self.hud = self.display if self.native_hud else self.canvas
+        self.needs_full_redraw = True
+    
+    def cycle_render_scale(self):
+        """Step to the next render scale in RENDER_SCALES"""
+        scales = RENDER_SCALES
+        index = scales.index(self.render_scale) + 1 if self.render_scale in scales else 0
+        self.set_render_scale(scales[index % len(scales)])
+    
+    def finish_world(self):
+        """With a native-resolution HUD, stretch the world onto the window before the HUD goes on top"""
+        if self.canvas is not None and self.hud is self.display:
+            self.upscale()
+    
+    def upscale(self):
+        """Stretch the low-resolution canvas over the whole window in one blit"""
+        if self.smooth_upscale:
+            pygame.transform.smoothscale(self.screen, self.display.get_size(), self.display)
+        else:
+            pygame.transform.scale(self.screen, self.display.get_size(), self.display)
+    
+    def record_first_frame(self):
+        """Note time from module import to the first presented frame"""
+        startup = self.startup
+        startup['first_frame_ms'] = (time.perf_counter() - IMPORT_STARTED) * 1000
+        if self.report_startup:
+            print(f"Startup: import {startup['import_ms']:.1f} ms, Game() {startup['init_ms']:.1f} ms, "
+                  f"first frame {startup['first_frame_ms']:.1f} ms after import started")
+    
+    def entity_counts(self):
+        """(prey, trees, particles) currently alive"""
+        particles = len(self.particles) if self.particles is not None else len(self.particle_group)
+        return len(self.prey_group), len(self.obstacle_group), particles
+    
+    def draw_profiler_overlay(self, counts=None):
+        """Frame-time percentiles and entity counts, returning the area drawn
+        
+        The pipelined renderer passes the counts from its snapshot so it
+        never reads the live groups the simulation thread is updating.
+        """
+        profiler = self.profiler
+        if not self.profiler_lines or profiler.index % 30 == 0:
+            p50, p95, p99 = profiler.frame_times()
+            phases = profiler.phase_times()
+            prey, trees, particles = counts if counts is not None else self.entity_counts()
+            self.profiler_lines = [
+                f"frame p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f} ms",
+                f"events {phases['handle_events']:.2f}  update {phases['update']:.2f}  "
+                f"draw {phases['draw']:.2f} ms",
+                f"prey {prey}  trees {trees}  particles {particles}",
+                f"quality {self.governor.name}" + ("" if self.governor.adaptive else " (fixed)")
+                + f"  render scale {self.render_scale:g}",
+            ]
+        
+        area = pygame.Rect(SCREEN_WIDTH - 420, 50, 410, 22 * len(self.profiler_lines) + 10)
+        self.hud.fill(BLACK, area)
+        for i, line in enumerate(self.profiler_lines):
+            text = self.text_cache.render(self.small_font, line, WHITE)
+            self.hud.blit(text, (area.x + 6, area.y + 5 + i * 22))
+        return area
+    
+    def draw_scrolling(self, group, alpha):
+        """Blit a scrolling group at interpolated positions, returning changed areas
+        
+        Mirrors RenderUpdates.draw, keeping spritedict/lostsprites current so
+        group.clear() still restores the right areas in dirty-rect mode.
+        """
+        spritedict = group.spritedict
+        dirty = group.lostsprites
+        group.lostsprites = []
+        blit = self.world.blit
+        store = getattr(group, 'store', None)
+        if store is not None:
+            placed = zip(store.sprites, store.positions(alpha))
+        else:
+            placed = ((sprite, (sprite.prev_x + (sprite.x - sprite.prev_x) * alpha, sprite.rect.y))
+                      for sprite in group.sprites())
+        for sprite, position in placed:
+            new_rect = blit(sprite.image, position)
+            old_rect = spritedict[sprite]
+            if old_rect and new_rect.colliderect(old_rect):
+                dirty.append(new_rect.union(old_rect))
+            else:
+                dirty.append(new_rect)
+                if old_rect:
+                    dirty.append(old_rect)
+            spritedict[sprite] = new_rect
+        return dirty
+    
+    def draw_sprites(self):
+        """Draw every sprite, returning the changed areas not tracked by groups"""
+        alpha = self.alpha
+        rects = []
+        rects.extend(self.draw_scrolling(self.prey_group, alpha))
+        rects.extend(self.draw_scrolling(self.obstacle_group, alpha))
+        if self.particles is not None:
+            particle_rect = self.particles.draw(self.screen, alpha, self.canvas)
+            if particle_rect:
+                rects.append(particle_rect)
+        elif self.canvas is None:
+            rects.extend(self.particle_group.draw(self.screen))
+        else:
+            rects.extend(self.canvas.blits([(particle.image, particle.rect) for particle in self.particle_group]))
+        
+        if self.jaguar:
+            jaguar = self.jaguar
+            x = jaguar.prev_x + (jaguar.x - jaguar.prev_x) * alpha
+            y = jaguar.prev_y + (jaguar.y - jaguar.prev_y) * alpha
+            rects.append(self.world.blit(jaguar.image, (x, y)))
+        return rects
+    
+    def draw_dirty(self):
+        """Restore, redraw and present only the regions that changed"""
+        background = self.get_background()
+        if self.needs_full_redraw:
+            self.screen.blit(background, (0, 0))
+        else:
+            self.prey_group.clear(self.screen, background)
+            self.obstacle_group.clear(self.screen, background)
+            self.particle_group.clear(self.screen, background)
+            for rect in self.dirty_regions:
+                self.screen.blit(background, rect, rect)
+        
+        # Group rects already cover each sprite's previous position; the
+        # rest (jaguar, particles, UI) are restored from last frame's list
+        rects = self.draw_sprites()
+        rects.extend(self.draw_ui())
+        if self.show_profiler:
+            rects.append(self.draw_profiler_overlay())
         
-        pygame.display.flip()
+        if self.needs_full_redraw:
+            self.present()
+            self.needs_full_redraw = False
+        else:
+            self.present(self.dirty_regions + rects)
+        self.dirty_regions = rects
     
     def run(self):
-        """Main game loop"""
+        """Main game loop: fixed-rate simulation, interpolated rendering"""
+        if self.pipelined:
+            self.run_pipelined()
+            return
+        tick_seconds = 1.0 / self.tick_rate
+        accumulator = 0.0
+        previous = time.perf_counter()
         running = True
         while running:
+            now = time.perf_counter()
+            accumulator += now - previous
+            previous = now
+            
             running = self.handle_events()
-            self.update()
+            
+            # Catch up on missed ticks, but never spiral when rendering falls behind
+            steps = 0
+            while accumulator >= tick_seconds and steps < MAX_CATCHUP_STEPS:
+                self.tick()
+                accumulator -= tick_seconds
+                steps += 1
+            if accumulator >= tick_seconds:
+                accumulator = tick_seconds * 0.999
+            
+            self.alpha = accumulator / tick_seconds if self.state == PLAYING else 1.0
             self.draw()
-            self.clock.tick(FPS)
+            self.clock.tick(self.max_fps)
+            self.govern_quality()
+            if self.profiler.enabled:
+                self.profiler.end_frame()
         
+        self.shutdown()
+    
+    def govern_quality(self):
+        """Feed the last frame's work time, without the frame-cap wait, to the governor"""
+        governor = self.governor
+        if governor.adaptive and governor.observe(self.clock.get_rawtime()):
+            self.apply_quality()
+    
+    def set_quality(self, name):
+        """Pin effects quality to a named level, or 'auto' to follow the frame budget"""
+        governor = self.governor
+        governor.adaptive = name == 'auto'
+        changed = False
+        if not governor.adaptive:
+            names = [level['name'] for level in governor.levels]
+            changed = governor.set_level(names.index(name))
+        self.apply_quality(log=changed)
+    
+    def apply_quality(self, log=True):
+        """Apply the governor's current settings, sending the transition that led to them to telemetry"""
+        settings = self.governor.settings
+        self.text_shadows = settings['shadows']
+        atlas = self.jaguar_atlas
+        if atlas.glow != settings['glow']:
+            atlas.glow = settings['glow']
+            if self.jaguar is not None and not self.headless:
+                atlas.prerender()
+        self.needs_full_redraw = True
+        
+        if log and self.governor.transitions:
+            _, previous, current, reason = self.governor.transitions[-1]
+            self.log_event('quality', level=current, previous=previous, reason=reason)
+    
+    def shutdown(self):
+        """Flush logs and traces, then close the window and exit"""
+        if self.recorder:
+            self.recorder.close()
+        if self.telemetry:
+            self.telemetry.close()
+        if self.trace_path and self.profiler.count:
+            self.profiler.export_chrome_trace(self.trace_path)
         pygame.quit()
         sys.exit()
+    
+    def run_pipelined(self):
+        """Main loop with the simulation on its own thread; this one handles events and renders"""
+        self.simulating = True
+        simulation = threading.Thread(target=self.simulate, name="simulation", daemon=True)
+        simulation.start()
+        
+        running = True
+        while running and simulation.is_alive():
+            running = self.handle_events()
+            self.held_mask = self.held_input()
+            self.draw_pipelined()
+            self.clock.tick(self.max_fps)
+            self.govern_quality()
+            if self.profiler.enabled:
+                self.profiler.end_frame()
+        
+        self.simulating = False
+        simulation.join()
+        print(self.render_buffer.report())
+        self.shutdown()
+    
+    def simulate(self):
+        """Simulation thread: apply queued actions, tick at a fixed rate, publish snapshots"""
+        tick_seconds = 1.0 / self.tick_rate
+        next_tick = time.perf_counter()
+        actions = self.actions
+        while self.simulating:
+            changed = False
+            while not actions.empty():
+                actions.get()()
+                changed = True
+            
+            now = time.perf_counter()
+            steps = 0
+            while now >= next_tick and steps < MAX_CATCHUP_STEPS:
+                self.tick()
+                next_tick += tick_seconds
+                steps += 1
+            if now >= next_tick:
+                # Same spiral guard as run(): drop ticks we can't catch up on
+                next_tick = now + tick_seconds
+            
+            if changed or (steps and self.state == PLAYING):
+                self.render_buffer.publish(self.render_snapshot())
+            time.sleep(max(0.0, min(next_tick - time.perf_counter(), tick_seconds)))
+    
+    def render_snapshot(self):
+        """Immutable copy of what draw_pipelined() needs for the current tick"""
+        jaguar = self.jaguar
+        if jaguar is not None:
+            jaguar = (jaguar.image, jaguar.prev_x, jaguar.prev_y, jaguar.x, jaguar.y)
+        if self.particles is not None:
+            particles = self.particles.render_state()
+        else:
+            particles = [(particle.image, particle.rect.topleft) for particle in self.particle_group]
+        return RenderSnapshot(
+            self.ticks, time.perf_counter(), self.state,
+            self.prey_group.render_items() + self.obstacle_group.render_items(),
+            jaguar, particles, self.hud_values(), self.entity_counts(),
+        )
+    
+    def draw_pipelined(self):
+        """Render the newest published snapshot, interpolated by the time since its tick"""
+        snapshot = self.render_buffer.take()
+        state = self.state
+        if state == MENU or snapshot is None:
+            self.draw_menu()
+        elif state == GAME_OVER:
+            self.draw_game_over()
+        else:
+            alpha = 1.0
+            if snapshot.state == PLAYING:
+                alpha = min(1.0, (time.perf_counter() - snapshot.time) * self.tick_rate)
+            world = self.world
+            self.draw_background()
+            world.blits([(image, (prev_x + (x - prev_x) * alpha, y))
+                         for image, prev_x, x, y in snapshot.sprites], False)
+            if self.particles is not None:
+                self.particles.draw_arrays(self.screen, *snapshot.particles, alpha, self.canvas)
+            else:
+                world.blits(snapshot.particles, False)
+            if snapshot.jaguar is not None:
+                image, prev_x, prev_y, x, y = snapshot.jaguar
+                world.blit(image, (prev_x + (x - prev_x) * alpha, prev_y + (y - prev_y) * alpha))
+            self.finish_world()
+            self.draw_ui(snapshot.hud)
+            if state == PAUSED:
+                self.draw_paused()
+        
+        if self.show_profiler:
+            self.draw_profiler_overlay(snapshot.counts if snapshot is not None else (0, 0, 0))
+        self.present()
+    
+    def run_headless(self, max_ticks, input_source=None):
+        """Step one session as fast as possible until game over or max_ticks"""
+        input_source = input_source or self.input_source
+        if self.state != PLAYING:
+            self.reset_game()
+        
+        peak_prey = peak_obstacles = 0
+        while self.state == PLAYING and self.ticks < max_ticks:
+            mask = input_source(self) if input_source else 0
+            if mask is None:
+                break
+            self.step(mask)
+            peak_prey = max(peak_prey, len(self.prey_group))
+            peak_obstacles = max(peak_obstacles, len(self.obstacle_group))
+        
+        if self.recorder:
+            self.recorder.finish()
+        
+        return {
+            'seed': self.session_seed,
+            'ticks': self.ticks,
+            'score': self.score,
+            'lives': self.lives,
+            'lives_lost': 3 - self.lives,
+            'spawn_rate': self.spawn_rate,
+            'peak_prey': peak_prey,
+            'peak_obstacles': peak_obstacles,
+            'game_over': self.state == GAME_OVER,
+        }
+
+
+# Everything above runs at import time
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
 
 
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="Jaguar Hunt Game")
+    parser.add_argument("--tail-buckets", type=int, default=TAIL_PHASE_BUCKETS,
+                        help="number of pre-rendered tail animation phases")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="redraw and present only changed screen regions")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed the game RNG for reproducible spawns")
+    parser.add_argument("--no-spatial-hash", action="store_true",
+                        help="always use linear spritecollide; otherwise groups switch to a spatial "
+                             f"hash at {SPATIAL_HASH_MIN}+ members and {SPATIAL_HASH_QUERIES}+ queries "
+                             "per tick (more than play's one query per group)")
+    parser.add_argument("--rect-collisions", action="store_true",
+                        help="collide on bounding rects instead of pixel masks")
+    parser.add_argument("--max-fps", type=int, default=FPS,
+                        help="render frame cap (0 = uncapped); simulation stays at TICK_RATE")
+    parser.add_argument("--record", metavar="FILE", default=None,
+                        help="record every session's inputs to a replay file")
+    parser.add_argument("--replay", metavar="FILE", nargs="+", default=None,
+                        help="play back a replay file (several with --headless)")
+    parser.add_argument("--headless", action="store_true",
+                        help="with --replay: re-simulate as fast as possible and print results")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every frame phase from the start (F3 shows the overlay)")
+    parser.add_argument("--trace", metavar="FILE", default=None,
+                        help="write a Chrome trace-event JSON of recent frames on exit (implies --profile)")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="print import time and time to the first frame")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="simulate on a separate thread and render its latest snapshot")
+    parser.add_argument("--telemetry", metavar="FILE", default=None,
+                        help="stream gameplay events to a gzipped JSON-lines file")
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="draw the world at this fraction of the window resolution (F5 cycles)")
+    parser.add_argument("--scaled-hud", action="store_true",
+                        help="with --render-scale: draw the HUD at the reduced resolution too")
+    parser.add_argument("--smooth-upscale", action="store_true",
+                        help="with --render-scale: filter the upscale instead of nearest neighbour")
+    parser.add_argument("--quality", choices=['auto'] + [level['name'] for level in QUALITY_LEVELS],
+                        default='auto', help="effects quality (auto: scale with the frame budget)")
+    args = parser.parse_args()
+    if args.replay and len(args.replay) > 1 and not args.headless:
+        parser.error("playing back several replays needs --headless; a window plays one file")
+    
+    if args.replay and args.headless:
+        for path in args.replay:
+            replay = ReplayInput(path)
+            result = replay.make_game(headless=True).run_headless(replay.ticks)
+            result['replay'] = path
+            print(json.dumps(result))
+        sys.exit()
+    
+    if args.replay:
+        replay = ReplayInput(args.replay[0])
+        game = replay.make_game(headless=False)
+        game.max_fps = args.max_fps
+        game.pipelined = args.pipelined
+        if args.telemetry:
+            game.telemetry = TelemetryWriter(args.telemetry)
+        game.set_quality(args.quality)
+        game.native_hud = not args.scaled_hud
+        game.smooth_upscale = args.smooth_upscale
+        game.set_render_scale(args.render_scale)
+        game.reset_game()
+    else:
+        game = Game(tail_buckets=args.tail_buckets, dirty_rects=args.dirty_rects, seed=args.seed,
+                    spatial_hash=not args.no_spatial_hash, max_fps=args.max_fps,
+                    pixel_collisions=not args.rect_collisions,
+                    record_path=args.record, profile=args.profile or bool(args.trace),
+                    trace_path=args.trace, pipelined=args.pipelined,
+                    telemetry_path=args.telemetry, quality=args.quality,
+                    render_scale=args.render_scale, native_hud=not args.scaled_hud,
+                    smooth_upscale=args.smooth_upscale)
+    game.report_startup = args.startup_time
     game.run()
\ No newline at end of file
@@ -0,0 +1,590 @@
+"""
+Jaguar Hunt - spectator server streaming live game state
+
+SpectatorServer runs an asyncio loop on its own thread and broadcasts every
+simulation tick to any number of TCP or Unix-socket clients. The game thread
+only captures the tick's state as plain values and hands it over through a
+one-slot mailbox; encoding and sending happen on the server thread. Ticks go
+out as deltas against the previous one (killed and spawned entity ids plus
+whole-pixel position changes), with a keyframe every KEYFRAME_INTERVAL ticks
+and whenever a client joins or falls behind. Clients that stop reading are
+skipped, never waited on, until their socket buffer drains; they then resync
+from a keyframe.
+
+Usage:
+    python jaguar_spectate.py serve --listen 127.0.0.1:7878
+    python jaguar_spectate.py watch --connect 127.0.0.1:7878
+    python jaguar_spectate.py loadtest --clients 300 --seconds 10
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import struct
+import threading
+import time
+from collections import deque
+from multiprocessing import Pipe, Process
+
+import jaguar_game_python as jg
+
+DEFAULT_ADDRESS = "127.0.0.1:7878"
+
+# A keyframe every 2 seconds of play
+KEYFRAME_INTERVAL = jg.TICK_RATE * 2
+
+# Bytes queued for one client before its frames are skipped
+CLIENT_HIGH_WATER = 64 * 1024
+
+# Kernel send buffer per client, so a backlog shows up as queued bytes
+# instead of disappearing into a buffer that autotunes to megabytes
+CLIENT_SEND_BUFFER = 64 * 1024
+
+# TCP receive buffer of the load test's stalled clients
+STALLED_RECEIVE_BUFFER = 4096
+
+# Broadcast timings kept for stats()
+COST_SAMPLES = 3600
+
+# Wire format: every message is a length-prefixed frame. The header carries
+# the tick, score, lives, game state, live entity count and the jaguar pose;
+# a keyframe follows it with every entity, a delta with the four counts and
+# then killed ids, spawned entities, small moves and far moves.
+FRAME = struct.Struct('<I')
+HEADER = struct.Struct('<BIiBBHhhB')  # kind, tick, score, lives, state, entities, jaguar x, y, flags
+COUNTS = struct.Struct('<HHHH')       # killed, spawned, moved, moved far
+ENTITY = struct.Struct('<HBhh')       # id, kind, x, y
+MOVE = struct.Struct('<Hbb')          # id, dx, dy
+PLACE = struct.Struct('<Hhh')         # id, x, y
+
+KEYFRAME = 0
+DELTA = 1
+
+# Jaguar flag bits
+JAGUAR_PRESENT = 1
+JAGUAR_FACING_RIGHT = 2
+JAGUAR_POUNCING = 4
+
+# Entity kind ids on the wire are the game's type ids
+TREE = jg.TREE_TYPE
+
+
+def parse_address(text):
+    """'unix:/path' or 'host:port' as ('unix', path) or ('tcp', (host, port))"""
+    if text.startswith('unix:'):
+        return 'unix', text[len('unix:'):]
+    host, _, port = text.rpartition(':')
+    return 'tcp', (host or '127.0.0.1', int(port))
+
+
+async def open_connection(address, receive_buffer=None):
+    """asyncio streams connected to a spectator server address, optionally with a small TCP receive window"""
+    kind, target = parse_address(address)
+    if kind == 'unix':
+        return await asyncio.open_unix_connection(target)
+    if receive_buffer is None:
+        return await asyncio.open_connection(*target)
+    # The window is fixed at connect time, so the option has to be set first
+    sock = socket.socket(socket.AF_INET6 if ':' in target[0] else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, target)
+    return await asyncio.open_connection(sock=sock)
+
+
+def group_state(group):
+    """(identity, kind id, x, y) per member, from the batched arrays when the group has them"""
+    store = getattr(group, 'store', None)
+    if store is not None:
+        sprites = store.sprites
+        n = store.count
+        kinds = store.type_id[:n].tolist()
+        xs = store.x[:n].tolist()
+        ys = store.y[:n].tolist()
+    else:
+        sprites = group.sprites()
+        kinds = [sprite.type_id for sprite in sprites]
+        xs = [sprite.x for sprite in sprites]
+        ys = [sprite.y for sprite in sprites]
+    return list(zip(map(id, sprites), kinds, xs, ys))
+
+
+def capture(game):
+    """The tick's visible state as plain values, cheap enough for the game thread"""
+    jaguar = game.jaguar
+    pose = None
+    if jaguar is not None:
+        pose = (jaguar.x, jaguar.y, jaguar.facing_right, jaguar.pouncing)
+    entities = group_state(game.prey_group) + group_state(game.obstacle_group)
+    return game.ticks, game.score, game.lives, game.state, pose, entities
+
+
+class DeltaEncoder:
+    """Turns successive captures into keyframe and delta frames with stable wire ids
+    
+    Entities are told apart by object identity. Pooled sprites come back
+    with new state, so an entity whose kind changed or that jumped forward
+    (scrolling only moves left) is sent as killed and respawned.
+    """
+    
+    def __init__(self):
+        # identity -> [wire id, kind, x, y] as last sent
+        self.entities = {}
+        self.next_id = 0
+    
+    def header(self, kind, snapshot):
+        """Frame header for a capture"""
+        tick, score, lives, state, pose, _ = snapshot
+        x = y = flags = 0
+        if pose is not None:
+            x, y = round(pose[0]), round(pose[1])
+            flags = JAGUAR_PRESENT
+            if pose[2]:
+                flags |= JAGUAR_FACING_RIGHT
+            if pose[3]:
+                flags |= JAGUAR_POUNCING
+        return HEADER.pack(kind, tick & 0xFFFFFFFF, score, max(0, lives), state, len(self.entities),
+                           x, y, flags)
+    
+    def delta(self, snapshot):
+        """Advance to a capture, returning the delta frame from the previous one"""
+        previous = self.entities
+        current = {}
+        killed = []
+        spawned = []
+        moved = []
+        far = []
+        for key, kind, x, y in snapshot[5]:
+            x = round(x)
+            y = round(y)
+            entry = previous.pop(key, None)
+            if entry is None or entry[1] != kind or x > entry[2]:
+                if entry is not None:
+                    killed.append(entry[0])
+                entry = [self.next_id, kind, x, y]
+                self.next_id = (self.next_id + 1) & 0xFFFF
+                spawned.append(entry)
+            else:
+                dx = x - entry[2]
+                dy = y - entry[3]
+                if dx or dy:
+                    if -128 <= dx <= 127 and -128 <= dy <= 127:
+                        moved.append((entry[0], dx, dy))
+                    else:
+                        far.append((entry[0], x, y))
+                    entry[2] = x
+                    entry[3] = y
+            current[key] = entry
+        killed.extend(entry[0] for entry in previous.values())
+        self.entities = current
+        
+        parts = [self.header(DELTA, snapshot), COUNTS.pack(len(killed), len(spawned), len(moved), len(far))]
+        if killed:
+            parts.append(struct.pack(f'<{len(killed)}H', *killed))
+        parts.extend(ENTITY.pack(*entry) for entry in spawned)
+        parts.extend(MOVE.pack(*move) for move in moved)
+        parts.extend(PLACE.pack(*place) for place in far)
+        payload = b''.join(parts)
+        return FRAME.pack(len(payload)) + payload
+    
+    def keyframe(self, snapshot):
+        """Full-state frame for the capture delta() last advanced to"""
+        parts = [self.header(KEYFRAME, snapshot)]
+        parts.extend(ENTITY.pack(*entry) for entry in self.entities.values())
+        payload = b''.join(parts)
+        return FRAME.pack(len(payload)) + payload
+
+
+class Spectator:
+    """Server-side bookkeeping for one connected client"""
+    
+    def __init__(self, writer):
+        self.writer = writer
+        self.transport = writer.transport
+        self.needs_keyframe = True
+        self.sent = 0
+        self.frames = 0
+        self.skipped = 0
+
+
+class SpectatorServer:
+    """Broadcasts game state to spectators from an asyncio loop on its own thread
+    
+    Assign to game.spectators; Game.step() then calls publish() every tick.
+    """
+    
+    def __init__(self, address=DEFAULT_ADDRESS, keyframe_interval=KEYFRAME_INTERVAL,
+                 high_water=CLIENT_HIGH_WATER):
+        self.address = address
+        self.bound = None
+        self.keyframe_interval = keyframe_interval
+        self.high_water = high_water
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="spectators", daemon=True)
+        self.server = None
+        self.clients = set()
+        self.encoder = DeltaEncoder()
+        
+        # One-slot mailbox: a tick the server hasn't reached yet is replaced,
+        # and the next delta simply covers both
+        self.lock = threading.Lock()
+        self.pending = None
+        
+        self.published = 0
+        self.coalesced = 0
+        self.broadcasts = 0
+        self.capture_ns = deque(maxlen=COST_SAMPLES)
+        self.broadcast_ns = deque(maxlen=COST_SAMPLES)
+    
+    def start(self):
+        """Start the loop thread and wait until the server is listening"""
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.listen(), self.loop).result()
+        return self
+    
+    async def listen(self):
+        """Open the listening socket"""
+        kind, target = parse_address(self.address)
+        if kind == 'unix':
+            if os.path.exists(target):
+                os.unlink(target)
+            self.server = await asyncio.start_unix_server(self.handle_client, target)
+            self.bound = self.address
+        else:
+            self.server = await asyncio.start_server(self.handle_client, *target)
+            host, port = self.server.sockets[0].getsockname()[:2]
+            self.bound = f"{host}:{port}"
+    
+    async def handle_client(self, reader, writer):
+        """Track a spectator until it disconnects; spectators never send anything"""
+        sock = writer.get_extra_info('socket')
+        if sock is not None and sock.family != socket.AF_UNIX:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, CLIENT_SEND_BUFFER)
+        client = Spectator(writer)
+        self.clients.add(client)
+        try:
+            while await reader.read(4096):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            writer.close()
+    
+    def publish(self, game):
+        """Game thread: hand this tick's state to the server without waiting on it"""
+        start = time.perf_counter_ns()
+        snapshot = capture(game)
+        with self.lock:
+            scheduled = self.pending is not None
+            self.pending = snapshot
+        self.capture_ns.append(time.perf_counter_ns() - start)
+        self.published += 1
+        if scheduled:
+            self.coalesced += 1
+        else:
+            # Waking the loop is a syscall, so the server thread may take the GIL here
+            self.loop.call_soon_threadsafe(self.broadcast)
+    
+    def broadcast(self):
+        """Server thread: encode the newest capture once and queue it for every client"""
+        start = time.perf_counter_ns()
+        with self.lock:
+            snapshot, self.pending = self.pending, None
+        delta = self.encoder.delta(snapshot)
+        keyframe_due = self.broadcasts % self.keyframe_interval == 0
+        keyframe = None
+        for client in tuple(self.clients):
+            transport = client.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > self.high_water:
+                # Too far behind: skip it, and resync once it catches up
+                client.skipped += 1
+                client.needs_keyframe = True
+                continue
+            if keyframe_due or client.needs_keyframe:
+                if keyframe is None:
+                    keyframe = self.encoder.keyframe(snapshot)
+                data = keyframe
+                client.needs_keyframe = False
+            else:
+                data = delta
+            transport.write(data)
+            client.sent += len(data)
+            client.frames += 1
+        self.broadcasts += 1
+        self.broadcast_ns.append(time.perf_counter_ns() - start)
+    
+    def stats(self):
+        """Tick counters and mean / p99 costs in microseconds"""
+        def summary(samples):
+            ordered = sorted(samples)
+            if not ordered:
+                return 0.0, 0.0
+            return statistics.fmean(ordered) / 1000, ordered[int(len(ordered) * 0.99)] / 1000
+        capture_mean, capture_p99 = summary(self.capture_ns)
+        broadcast_mean, broadcast_p99 = summary(self.broadcast_ns)
+        return {
+            'clients': len(self.clients),
+            'published': self.published,
+            'coalesced': self.coalesced,
+            'broadcasts': self.broadcasts,
+            'capture_us': capture_mean,
+            'capture_us_p99': capture_p99,
+            'broadcast_us': broadcast_mean,
+            'broadcast_us_p99': broadcast_p99,
+            'skipped': sum(client.skipped for client in self.clients),
+        }
+    
+    def close(self):
+        """Disconnect everyone and stop the loop thread"""
+        async def shutdown():
+            self.server.close()
+            for client in tuple(self.clients):
+                client.transport.abort()
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        kind, target = parse_address(self.address)
+        if kind == 'unix' and os.path.exists(target):
+            os.unlink(target)
+
+
+class SpectatorClient:
+    """Headless spectator that rebuilds the game state from keyframes and deltas"""
+    
+    def __init__(self):
+        self.entities = {}
+        self.tick = 0
+        self.score = 0
+        self.lives = 0
+        self.state = jg.MENU
+        self.jaguar = None
+        self.synced = False
+        self.received = 0
+        self.frames = 0
+        self.keyframes = 0
+        self.desyncs = 0
+    
+    def apply(self, payload):
+        """Apply one frame's payload to the local state"""
+        kind, self.tick, self.score, self.lives, self.state, count, x, y, flags = HEADER.unpack_from(payload)
+        self.jaguar = None
+        if flags & JAGUAR_PRESENT:
+            self.jaguar = (x, y, bool(flags & JAGUAR_FACING_RIGHT), bool(flags & JAGUAR_POUNCING))
+        offset = HEADER.size
+        
+        if kind == KEYFRAME:
+            end = offset + count * ENTITY.size
+            self.entities = {wire_id: [kind, x, y] for wire_id, kind, x, y
+                             in ENTITY.iter_unpack(payload[offset:end])}
+            self.synced = True
+            self.keyframes += 1
+            return
+        if not self.synced:
+            return
+        
+        entities = self.entities
+        killed, spawned, moved, far = COUNTS.unpack_from(payload, offset)
+        offset += COUNTS.size
+        for wire_id in struct.unpack_from(f'<{killed}H', payload, offset):
+            entities.pop(wire_id, None)
+        offset += killed * 2
+        end = offset + spawned * ENTITY.size
+        for wire_id, kind, x, y in ENTITY.iter_unpack(payload[offset:end]):
+            entities[wire_id] = [kind, x, y]
+        offset = end
+        end = offset + moved * MOVE.size
+        for wire_id, dx, dy in MOVE.iter_unpack(payload[offset:end]):
+            entity = entities[wire_id]
+            entity[1] += dx
+            entity[2] += dy
+        offset = end
+        end = offset + far * PLACE.size
+        for wire_id, x, y in PLACE.iter_unpack(payload[offset:end]):
+            entity = entities[wire_id]
+            entity[1] = x
+            entity[2] = y
+        
+        if len(entities) != count:
+            # Lost track; ignore deltas until the next keyframe
+            self.desyncs += 1
+            self.synced = False
+    
+    async def run(self, address, read=True):
+        """Read frames until the server goes away; read=False connects and never reads (a stalled client)"""
+        # A stalled client keeps its window small so the backlog builds up on the server
+        reader, writer = await open_connection(address, None if read else STALLED_RECEIVE_BUFFER)
+        try:
+            if not read:
+                await asyncio.Event().wait()
+            while True:
+                (length,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+                payload = await reader.readexactly(length)
+                self.received += FRAME.size + length
+                self.frames += 1
+                self.apply(payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run_clients(address, count, stalled, seconds):
+    """Run count reading clients plus some stalled ones for a while, returning the readers"""
+    clients = [SpectatorClient() for _ in range(count + stalled)]
+    tasks = [asyncio.ensure_future(client.run(address, read=index < count))
+             for index, client in enumerate(clients)]
+    await asyncio.sleep(seconds)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return clients[:count]
+
+
+def client_process(conn, address, count, stalled, seconds):
+    """Load test worker: run spectators and report their counters"""
+    clients = asyncio.run(run_clients(address, count, stalled, seconds))
+    conn.send([(client.received, client.frames, client.keyframes, client.desyncs) for client in clients])
+    conn.close()
+
+
+def serve(args):
+    """Play the game in a window while streaming it to spectators"""
+    server = SpectatorServer(args.listen).start()
+    print(f"Spectators can connect to {server.bound}")
+    game = jg.Game(seed=args.seed, pipelined=args.pipelined)
+    game.spectators = server
+    game.run()
+
+
+def watch(args):
+    """Follow a server and print what a spectator sees once a second"""
+    client = SpectatorClient()
+    
+    async def report():
+        received = 0
+        while True:
+            await asyncio.sleep(1)
+            prey = sum(1 for kind, _, _ in client.entities.values() if kind != TREE)
+            print(f"tick {client.tick}  score {client.score}  lives {client.lives}  "
+                  f"prey {prey}  trees {len(client.entities) - prey}  "
+                  f"{(client.received - received) / 1024:.1f} KiB/s  desyncs {client.desyncs}")
+            received = client.received
+    
+    async def main():
+        reporter = asyncio.ensure_future(report())
+        try:
+            await client.run(args.connect)
+        finally:
+            reporter.cancel()
+    
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+def top_up_prey(game, count):
+    """Keep at least count prey on the field"""
+    while len(game.prey_group) < count:
+        prey = game.prey_pool.acquire(game.rng)
+        prey.x = prey.prev_x = game.rng.uniform(0, jg.SCREEN_WIDTH)
+        prey.rect.x = prey.x
+        game.add_entity(prey, game.prey_group)
+
+
+def loadtest(args):
+    """Stream a bot-played game at the real tick rate to many local spectators"""
+    from jaguar_batch import hunter_policy
+    
+    server = SpectatorServer(args.listen, high_water=args.high_water).start()
+    total = args.clients + args.stalled
+    workers = []
+    for index in range(args.processes):
+        count = args.clients * (index + 1) // args.processes - args.clients * index // args.processes
+        stalled = args.stalled * (index + 1) // args.processes - args.stalled * index // args.processes
+        parent, child = Pipe()
+        process = Process(target=client_process, daemon=True,
+                          args=(child, server.bound, count, stalled, args.seconds + 2))
+        process.start()
+        workers.append((parent, process))
+    
+    deadline = time.perf_counter() + 10
+    while len(server.clients) < total and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    print(f"{len(server.clients)} spectators connected to {server.bound} "
+          f"({args.stalled} of them never read)")
+    
+    game = jg.Game(headless=True, seed=args.seed, snapshot_interval=0)
+    game.spectators = server
+    game.reset_game()
+    tick_seconds = 1.0 / game.tick_rate
+    step_times = []
+    next_tick = time.perf_counter()
+    end = next_tick + args.seconds
+    while time.perf_counter() < end:
+        if game.state != jg.PLAYING:
+            game.reset_game()
+        top_up_prey(game, args.prey)
+        start = time.perf_counter()
+        game.step(hunter_policy(game))
+        step_times.append(time.perf_counter() - start)
+        next_tick += tick_seconds
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+    
+    stats = server.stats()
+    results = []
+    for conn, process in workers:
+        results.extend(conn.recv())
+        process.join()
+    server.close()
+    
+    step_times.sort()
+    frames = sum(frames for _, frames, _, _ in results)
+    received = sum(received for received, _, _, _ in results)
+    print(f"{len(step_times)} ticks in {args.seconds:.0f} s, {len(server.encoder.entities)} entities at the end")
+    print(f"game thread: step {statistics.fmean(step_times) * 1e6:.0f} us mean, "
+          f"{step_times[-1] * 1e6:.0f} us max, of which capture {stats['capture_us']:.1f} us mean")
+    print(f"server thread: {stats['broadcast_us']:.0f} us per tick mean, {stats['broadcast_us_p99']:.0f} us p99 "
+          f"(encode once + {args.clients} writes), {stats['coalesced']} ticks coalesced")
+    if results:
+        print(f"per client: {received / len(results) / args.seconds / 1024:.2f} KiB/s, "
+              f"{received / max(1, frames):.0f} B/frame, "
+              f"{sum(k for _, _, k, _ in results) / len(results):.1f} keyframes, "
+              f"{sum(d for _, _, _, d in results)} desyncs in total")
+    print(f"backpressure: {stats['skipped']} frames skipped for stalled clients")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jaguar Hunt spectator server")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    serve_parser = commands.add_parser('serve', help="play in a window and stream to spectators")
+    serve_parser.add_argument("--listen", default=DEFAULT_ADDRESS, help="host:port or unix:/path")
+    serve_parser.add_argument("--seed", type=int, default=None)
+    serve_parser.add_argument("--pipelined", action="store_true")
+    
+    watch_parser = commands.add_parser('watch', help="headless spectator printing a status line")
+    watch_parser.add_argument("--connect", default=DEFAULT_ADDRESS, help="host:port or unix:/path")
+    
+    load_parser = commands.add_parser('loadtest', help="many local spectators against a bot game")
+    load_parser.add_argument("--listen", default="127.0.0.1:0", help="host:port or unix:/path")
+    load_parser.add_argument("--clients", type=int, default=300)
+    load_parser.add_argument("--stalled", type=int, default=5, help="extra clients that never read")
+    load_parser.add_argument("--processes", type=int, default=4, help="client processes")
+    load_parser.add_argument("--seconds", type=float, default=10)
+    load_parser.add_argument("--prey", type=int, default=0, help="keep at least this many prey on the field")
+    load_parser.add_argument("--high-water", type=int, default=CLIENT_HIGH_WATER,
+                             help="bytes queued per client before frames are skipped")
+    load_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    {'serve': serve, 'watch': watch, 'loadtest': loadtest}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()